@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Benchmark the logo pipeline on synthetic fixtures.
+
+Times remove_background (global and --match connected), make_transparent,
+has_transparency and analyze_file on deterministic navy/charcoal/teal
+fixtures from 16px to 8192px, reporting throughput (megapixels/s) and
+peak memory, and how much connected matching costs over global matching
+at each size. Results are written as JSON; with a stored baseline, any
+stage that got slower than the tolerance allows fails the run.
+
+Timings only compare on the same hardware, so no baseline ships with
+the repo; without one the run just reports and exits 0. To gate on a
+machine, first record a baseline there from a clean checkout:
+
+    python tools/benchmark-logos.py --save-baseline
+
+which writes tools/logo-benchmark-baseline.json (or --baseline PATH).
+Commit it, or keep it on the runner, and only then add
+--require-baseline to that machine's invocation: it fails when the
+baseline is missing or was made from other fixtures, instead of passing
+without a check. No default invocation passes the flag.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+from logokit.classifier import CACHE_DIR
+from logokit.fixtures import FIXTURE_SIZES, FIXTURE_VERSION, fixture_path
+from logokit.tiled import peak_rss_mib
+
+BASELINE_PATH = Path(__file__).resolve().parent / "logo-benchmark-baseline.json"
+RESULTS_VERSION = 1
+
+STAGES = ('remove_background', 'remove_background_connected', 'make_transparent',
+          'has_transparency', 'analyze_file')
+
+# Each timing is the best of at least MIN_RUNS runs, repeated until MIN_SECONDS
+MIN_RUNS = 3
+MIN_SECONDS = 0.2
+
+# Slowdowns smaller than this are timer noise, whatever the tolerance says
+NOISE_SECONDS = 0.001
+
+
+def _stage(stage):
+    """Return a ``run(fixture, stripped, scratch)`` callable for ``stage``."""
+    if stage == 'remove_background':
+        from logokit.strip import remove_background
+        return lambda fixture, stripped, scratch: _check(remove_background(fixture, stripped))
+    if stage == 'remove_background_connected':
+        from logokit.strip import remove_background
+        return lambda fixture, stripped, scratch: _check(
+            remove_background(fixture, scratch, connected=True)
+        )
+    if stage == 'make_transparent':
+        from logokit.strip import make_transparent
+        return lambda fixture, stripped, scratch: _check(make_transparent(fixture, scratch))
+
+    from logokit.report import analyze_file, has_transparency
+    if stage == 'has_transparency':
+        from PIL import Image
+        return lambda fixture, stripped, scratch: has_transparency(Image.open(stripped))
+
+    def analyze(fixture, stripped, scratch):
+        info = analyze_file(stripped)
+        if 'error' in info:
+            raise RuntimeError(info['error'])
+    return analyze
+
+
+def _check(result):
+    if not result[0]:
+        raise RuntimeError(result[1])
+
+
+def measure(stage, fixture, stripped, scratch):
+    """Time ``stage`` in this (fresh) process; returns (seconds, base MiB, peak MiB).
+
+    One untimed warm-up run loads the classifier table and primes caches.
+    """
+    run = _stage(stage)
+    base = peak_rss_mib()
+    run(fixture, stripped, scratch)
+
+    timings = []
+    while len(timings) < MIN_RUNS or sum(timings) < MIN_SECONDS:
+        start = time.perf_counter()
+        run(fixture, stripped, scratch)
+        timings.append(time.perf_counter() - start)
+    return min(timings), base, peak_rss_mib()
+
+
+def run_benchmarks(stages, sizes, fixtures_dir):
+    """Measure every stage at every size, each in a fresh spawned process.
+
+    A fresh process per measurement keeps peak memory attributable to the
+    one stage and size, and stops earlier runs warming the later ones.
+    """
+    results = []
+    for size in sizes:
+        fixture = fixture_path(fixtures_dir, size)
+        stripped = fixtures_dir / f"stripped-v{FIXTURE_VERSION}-{size}.png"
+        scratch = fixtures_dir / f"scratch-v{FIXTURE_VERSION}-{size}.png"
+
+        # remove_background writes the stripped copy the read-only stages use
+        order = sorted(stages, key=lambda s: s != 'remove_background')
+        if 'remove_background' not in stages and not stripped.exists():
+            order.insert(0, 'remove_background')
+
+        for stage in order:
+            with ProcessPoolExecutor(1, mp_context=get_context('spawn')) as pool:
+                seconds, base, peak = pool.submit(
+                    measure, stage, fixture, stripped, scratch
+                ).result()
+            if stage not in stages:
+                continue
+
+            megapixels = size * size / 1e6
+            result = {
+                'stage': stage,
+                'size': size,
+                'seconds': seconds,
+                'mp_per_s': megapixels / seconds,
+                'peak_rss_mib': peak,
+                'rss_growth_mib': None if peak is None else peak - base,
+            }
+            results.append(result)
+            print(f"  {stage:<27} {size:>6}px {seconds * 1000:>11.2f} ms "
+                  f"{result['mp_per_s']:>10.2f} MP/s "
+                  f"{'-' if peak is None else f'{peak:.1f}':>10} MiB")
+        scratch.unlink(missing_ok=True)
+    return results
+
+
+def print_connected_cost(results):
+    """Print connected matching's time relative to global matching, per size."""
+    seconds = {(r['stage'], r['size']): r['seconds'] for r in results}
+    for (stage, size), connected in seconds.items():
+        if stage != 'remove_background_connected' or ('remove_background', size) not in seconds:
+            continue
+        ratio = connected / seconds['remove_background', size]
+        print(f"  {'connected vs global':<27} {size:>6}px {ratio:>11.2f}x")
+
+
+def find_regressions(results, baseline, tolerance):
+    """Results slower than their baseline entry by more than ``tolerance``."""
+    previous = {(r['stage'], r['size']): r['seconds'] for r in baseline.get('results', [])}
+    regressions = []
+    for result in results:
+        before = previous.get((result['stage'], result['size']))
+        if before is None:
+            continue
+        slowdown = result['seconds'] - before
+        if slowdown > max(before * tolerance, NOISE_SECONDS):
+            regressions.append((result, before))
+    return regressions
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=list(FIXTURE_SIZES),
+        help=f"fixture sizes in pixels (default: {' '.join(map(str, FIXTURE_SIZES))})",
+    )
+    parser.add_argument(
+        '--stages', nargs='+', choices=STAGES, default=list(STAGES),
+        help="stages to time (default: all)",
+    )
+    parser.add_argument(
+        '--fixtures', type=Path, default=CACHE_DIR / 'fixtures',
+        help="directory for the generated fixtures (default: %(default)s)",
+    )
+    parser.add_argument(
+        '--output', type=Path, default=Path('logo-benchmark.json'),
+        help="where to write the JSON results (default: %(default)s)",
+    )
+    parser.add_argument(
+        '--baseline', type=Path, default=BASELINE_PATH,
+        help="baseline results to compare against, if present (default: %(default)s)",
+    )
+    parser.add_argument(
+        '--save-baseline', action='store_true',
+        help="store these results as the new baseline instead of comparing",
+    )
+    parser.add_argument(
+        '--require-baseline', action='store_true',
+        help="fail when there is no usable baseline to compare against "
+             "(only once one has been saved with --save-baseline)",
+    )
+    parser.add_argument(
+        '--tolerance', type=float, default=0.25,
+        help="allowed slowdown before a stage counts as regressed (default: 0.25 = 25%%)",
+    )
+    args = parser.parse_args()
+
+    args.fixtures.mkdir(parents=True, exist_ok=True)
+
+    print("Benchmarking logo pipeline...")
+    print("=" * 70)
+    results = run_benchmarks(args.stages, sorted(args.sizes), args.fixtures)
+    print("=" * 70)
+    print_connected_cost(results)
+
+    report = {
+        'version': RESULTS_VERSION,
+        'fixture_version': FIXTURE_VERSION,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    args.output.write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
+    print(f"Results written to {args.output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    # Without a usable baseline nothing is checked; that only passes if allowed
+    unchecked = 1 if args.require_baseline else 0
+    if not args.baseline.exists():
+        print("No baseline to compare against (use --save-baseline to store one)")
+        return unchecked
+
+    baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+    if baseline.get('fixture_version') != FIXTURE_VERSION:
+        print(f"Baseline uses different fixtures; not comparing ({args.baseline})")
+        return unchecked
+
+    regressions = find_regressions(results, baseline, args.tolerance)
+    for result, before in regressions:
+        print(f"  ✗ {result['stage']} at {result['size']}px: "
+              f"{before * 1000:.2f} ms -> {result['seconds'] * 1000:.2f} ms")
+    if regressions:
+        print(f"Regressions: {len(regressions)} (tolerance {args.tolerance:.0%})")
+        return 1
+    print(f"✓ No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
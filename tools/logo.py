@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+Logo asset tools: ``python tools/logo.py {analyze,strip,pack,verify,sync}``.
+
+Run from the repo root; ``python tools/logo.py COMMAND --help`` lists each
+command's options.
+"""
+
+import sys
+
+from logokit.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
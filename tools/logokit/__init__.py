@@ -0,0 +1,43 @@
+"""
+Shared logo-processing code and the ``logo`` command line.
+
+Run from the repo root as ``python tools/logo.py <command>`` (or
+``python -m logokit`` with ``tools/`` on ``sys.path``); see cli.py.
+
+Other Python code, such as a build step, can call the engine in-process
+instead of spawning scripts::
+
+    import logokit
+    img, removed = logokit.strip_background(Image.open(path))
+
+The names below are imported from their modules on first use, so
+``import logokit`` itself stays cheap.
+"""
+
+import importlib
+
+# Public name -> module it lives in
+_EXPORTS = {
+    'BACKGROUND_COLORS': 'engine',
+    'THRESHOLD': 'engine',
+    'background_mask': 'engine',
+    'strip_background': 'engine',
+    'remove_background': 'strip',
+    'make_transparent': 'strip',
+    'analyze_file': 'report',
+    'AssetIndex': 'index',
+    'alpha_stats': 'analyze',
+    'build_ico': 'ico',
+    'save_png': 'optimize',
+    'LOGO_DIR': 'paths',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'logokit' has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
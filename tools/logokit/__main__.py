@@ -0,0 +1,7 @@
+"""``python -m logokit`` runs the ``logo`` CLI (with tools/ on sys.path)."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
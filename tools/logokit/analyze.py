@@ -0,0 +1,90 @@
+"""
+Fast transparency and alpha statistics.
+
+Everything comes from one decode and Pillow's native channel operations
+(histogram, getbbox, getcolors), never a Python loop over pixels.
+"""
+
+from collections import Counter
+
+# Modes that carry an alpha channel as-is
+ALPHA_MODES = ('RGBA', 'LA', 'PA')
+
+
+def _with_alpha(img):
+    """Return ``img`` in a mode with an alpha channel, or None if it has none."""
+    if img.mode in ALPHA_MODES:
+        return img
+    if 'transparency' in img.info:
+        return img.convert('RGBA')
+    return None
+
+
+def dominant_edge_color(img):
+    """Most common RGB color along the 1px border, as a hex string."""
+    rgb = img.convert('RGB')
+    width, height = rgb.size
+    counts = Counter()
+    for box in ((0, 0, width, 1), (0, height - 1, width, height),
+                (0, 0, 1, height), (width - 1, 0, width, height)):
+        colors = rgb.crop(box).getcolors(width + height)
+        counts.update({color: n for n, color in colors})
+    (r, g, b), _ = counts.most_common(1)[0]
+    return f"#{r:02X}{g:02X}{b:02X}"
+
+
+def alpha_histogram(img, buckets=8):
+    """Counts of pixels per alpha range, from clear (first) to opaque (last).
+
+    The 256 alpha levels are split into ``buckets`` equal ranges, except
+    that fully clear (0) and fully opaque (255) always get a bucket of
+    their own, so a hard cut shows up as two non-empty buckets and a soft
+    edge fills the ones in between. Returns None without an alpha channel.
+    """
+    rgba = _with_alpha(img)
+    if rgba is None:
+        return None
+    hist = rgba.getchannel('A').histogram()
+    step = 254 / buckets
+    counts = [hist[0]] + [0] * buckets + [hist[255]]
+    for level in range(1, 255):
+        counts[1 + min(int((level - 1) / step), buckets - 1)] += hist[level]
+    return counts
+
+
+def alpha_stats(img):
+    """Transparency statistics for an image.
+
+    Returns a dict with:
+      transparent           any pixel below full opacity
+      transparent_fraction  share of fully transparent pixels
+      bbox                  (left, top, right, bottom) of non-transparent content
+      edge_color            dominant border color (hex)
+      softness              share of visible pixels with partial alpha;
+                            ~0 for a hard binary cut, higher for soft edges
+    """
+    width, height = img.size
+    total = width * height
+    rgba = _with_alpha(img)
+
+    if rgba is None:
+        return {
+            'transparent': False,
+            'transparent_fraction': 0.0,
+            'bbox': (0, 0, width, height),
+            'edge_color': dominant_edge_color(img),
+            'softness': 0.0,
+        }
+
+    alpha = rgba.getchannel('A')
+    hist = alpha.histogram()
+    visible = total - hist[0]
+    return {
+        'transparent': hist[255] < total,
+        'transparent_fraction': hist[0] / total,
+        'bbox': alpha.getbbox(),
+        # From the RGBA copy: Pillow warns when a tRNS palette image goes
+        # straight to RGB
+        'edge_color': dominant_edge_color(rgba),
+        'softness': sum(hist[1:255]) / visible if visible else 0.0,
+    }
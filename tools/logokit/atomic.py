@@ -0,0 +1,188 @@
+"""
+Crash-safe output writes.
+
+Every file the logo tools produce is written to a temp file in the same
+directory, fsynced, checked (a PNG's chunk chain and every chunk CRC, an
+ICO's directory and its PNG frames; no pixel decode) and only then renamed
+over the target. A killed or crashed run leaves either the old file or the
+new one, never a truncated PNG that later gets copied into the frontend.
+
+``--fsync batch`` (or LOGO_FSYNC=batch) skips the per-file fsyncs and
+flushes everything once at the end of the run with os.sync(). Renames stay
+atomic, so a killed process still can't leave a partial file; only an OS
+crash before the final sync can lose the run's writes. Platforms without
+os.sync() always fsync per file.
+"""
+
+import io
+import os
+import secrets
+import shutil
+import struct
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+
+from .probe import PNG_SIGNATURE
+
+FSYNC_ENV = 'LOGO_FSYNC'
+EACH = 'each'
+BATCH = 'batch'
+
+# Largest piece of a file read at once while checking CRCs
+READ_SIZE = 1 << 20
+
+
+def set_fsync_mode(mode):
+    """Select EACH or BATCH; worker processes inherit it through the environment."""
+    os.environ[FSYNC_ENV] = mode
+
+
+def _batched():
+    return os.environ.get(FSYNC_ENV, EACH) == BATCH and hasattr(os, 'sync')
+
+
+def sync_batch():
+    """End-of-run barrier for batch mode: flush every write at once."""
+    if _batched():
+        os.sync()
+
+
+def _check_png_stream(f, name):
+    """Walk a PNG's chunks from ``f``, verifying each CRC, through IEND."""
+    if f.read(8) != PNG_SIGNATURE:
+        raise ValueError(f"{name}: not a PNG (bad signature)")
+    first = True
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            raise ValueError(f"{name}: truncated before IEND")
+        length, ctype = struct.unpack('>I4s', header)
+        if first and ctype != b'IHDR':
+            raise ValueError(f"{name}: first chunk is {ctype!r}, not IHDR")
+        first = False
+
+        crc = zlib.crc32(ctype)
+        remaining = length
+        while remaining:
+            piece = f.read(min(remaining, READ_SIZE))
+            if not piece:
+                raise ValueError(f"{name}: truncated in {ctype.decode('latin-1')} chunk")
+            crc = zlib.crc32(piece, crc)
+            remaining -= len(piece)
+
+        stored = f.read(4)
+        if len(stored) < 4 or struct.unpack('>I', stored)[0] != crc & 0xFFFFFFFF:
+            raise ValueError(f"{name}: CRC mismatch in {ctype.decode('latin-1')} chunk")
+        if ctype == b'IEND':
+            return
+
+
+def _check_ico(data, name):
+    """Check an ICO's directory bounds and CRC-check its PNG frames."""
+    if len(data) < 6:
+        raise ValueError(f"{name}: truncated ICO header")
+    reserved, kind, count = struct.unpack('<HHH', data[:6])
+    if reserved != 0 or kind != 1 or count == 0:
+        raise ValueError(f"{name}: not an ICO")
+    if len(data) < 6 + 16 * count:
+        raise ValueError(f"{name}: truncated ICO directory")
+    for i in range(count):
+        size, offset = struct.unpack('<II', data[6 + 16 * i + 8:6 + 16 * i + 16])
+        if offset + size > len(data):
+            raise ValueError(f"{name}: frame {i} runs past the end of the file")
+        frame = data[offset:offset + size]
+        if frame.startswith(PNG_SIGNATURE):
+            _check_png_stream(io.BytesIO(frame), f"{name} frame {i}")
+
+
+def verify_file(path, target=None):
+    """Raise ValueError if ``path`` isn't a complete PNG/ICO.
+
+    ``target`` is the path the file is destined for (a temp file is
+    checked as its target's type and reported under its name). Other file
+    types aren't checked.
+    """
+    target = Path(target or path)
+    kind = target.suffix.lower()
+    if kind == '.png':
+        with open(path, 'rb') as f:
+            _check_png_stream(f, target.name)
+    elif kind == '.ico':
+        _check_ico(Path(path).read_bytes(), target.name)
+
+
+def _temp_path(path):
+    return path.with_name(f"{path.name}.{os.getpid()}.{secrets.token_hex(4)}.tmp")
+
+
+def _fsync_dir(directory):
+    if os.name == 'nt':
+        return  # Directories can't be opened for fsync on Windows
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _commit(tmp_path, path):
+    """Verify ``tmp_path`` as ``path``'s type and rename it into place."""
+    try:
+        verify_file(tmp_path, path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    if not _batched():
+        _fsync_dir(path.parent)
+
+
+@contextmanager
+def atomic_open(path):
+    """Open a temp file for writing that replaces ``path`` on success.
+
+    If the block raises, or the written PNG/ICO fails verification, the
+    temp file is removed and ``path`` is left untouched.
+    """
+    path = Path(path)
+    tmp_path = _temp_path(path)
+    try:
+        with open(tmp_path, 'xb') as f:
+            yield f
+            f.flush()
+            if not _batched():
+                os.fsync(f.fileno())
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    _commit(tmp_path, path)
+
+
+def write_atomic(path, data):
+    """Atomically replace ``path`` with ``data``."""
+    with atomic_open(path) as f:
+        f.write(data)
+
+
+def copy_atomic(source, dest):
+    """shutil.copy2() ``source`` to ``dest`` through a verified temp file."""
+    dest = Path(dest)
+    tmp_path = _temp_path(dest)
+    try:
+        shutil.copy2(source, tmp_path)
+        if not _batched():
+            with open(tmp_path, 'rb+') as f:
+                os.fsync(f.fileno())
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    _commit(tmp_path, dest)
+
+
+def add_fsync_argument(parser):
+    """Add the shared ``--fsync`` option to an argparse parser."""
+    parser.add_argument(
+        '--fsync', choices=[EACH, BATCH], default=os.environ.get(FSYNC_ENV, EACH),
+        help="fsync every output as it is written (default), or once at the end of the run",
+    )
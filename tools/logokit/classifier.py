@@ -0,0 +1,157 @@
+"""
+Precomputed RGB -> background lookup table.
+
+Background matching only depends on the RGB triple, so each palette +
+threshold + metric is compiled once into a 2^24-entry table indexed by
+``r | g << 8 | b << 16``. Classifying a pixel is then a single table read,
+whatever the palette size. Compiled tables are cached on disk as packed
+bitsets (2 MiB each), keyed by a hash of the palette and parameters.
+
+Both caches are bounded: a process keeps the MEMORY_TABLES most recently
+used tables (16 MiB each unpacked), and CACHE_DIR keeps the most recently
+used table files up to DISK_CACHE_BYTES (see prune_tables()).
+"""
+
+import functools
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+# Bump when the table layout or matching rules change
+TABLE_VERSION = 1
+
+CACHE_DIR = Path(os.environ.get('LOGOKIT_CACHE_DIR', Path.home() / '.cache' / 'logokit'))
+
+# Compiled tables a process keeps in memory, most recently used first
+MEMORY_TABLES = 4
+
+# Total size of the table files kept in CACHE_DIR; older ones are deleted
+DISK_CACHE_BYTES = 128 << 20
+
+# Table files in CACHE_DIR (binary and soft-matte tables)
+TABLE_PATTERNS = ('bg-*.npy', 'matte-*.npy')
+
+# Distance metrics
+EUCLIDEAN = 'euclidean'  # sqrt(dr² + dg² + db²) <= threshold
+BOX = 'box'              # |dr|, |dg| and |db| all <= threshold
+
+
+def palette_rgb(colors):
+    """Reduce a palette to unique RGB triples, keeping order.
+
+    Palette entries may carry an alpha component (older callers listed both
+    RGBA and RGB forms); matching only ever depends on RGB.
+    """
+    seen = []
+    for color in colors:
+        rgb = tuple(int(c) for c in color[:3])
+        if rgb not in seen:
+            seen.append(rgb)
+    return seen
+
+
+def palette_key(colors, threshold, metric):
+    """Stable hash of a palette and its matching parameters."""
+    payload = json.dumps({
+        'version': TABLE_VERSION,
+        'colors': sorted(palette_rgb(colors)),
+        'threshold': threshold,
+        'metric': metric,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def build_table(colors, threshold, metric):
+    """Compile a palette into a boolean table of 2^24 RGB entries.
+
+    Only the cube of side ``2 * threshold + 1`` around each palette color
+    can match, so building costs O(palette × threshold³), not O(2^24).
+    """
+    if metric not in (EUCLIDEAN, BOX):
+        raise ValueError(f"Unknown metric: {metric}")
+
+    table = np.zeros(1 << 24, dtype=bool)
+    radius = int(threshold)
+    offsets = np.arange(-radius, radius + 1)
+
+    for color in palette_rgb(colors):
+        r, g, b = np.meshgrid(*(offsets + c for c in color), indexing='ij')
+        hit = (r >= 0) & (r < 256) & (g >= 0) & (g < 256) & (b >= 0) & (b < 256)
+        if metric == EUCLIDEAN:
+            dr, dg, db = r - color[0], g - color[1], b - color[2]
+            hit &= dr * dr + dg * dg + db * db <= threshold * threshold
+        table[r[hit] | (g[hit] << 8) | (b[hit] << 16)] = True
+    return table
+
+
+def load_table(cache_path):
+    """The array saved at ``cache_path``, or None; a hit counts as a use."""
+    try:
+        array = np.load(cache_path)
+        os.utime(cache_path)
+        return array
+    except (OSError, ValueError):
+        return None
+
+
+def store_table(cache_path, array):
+    """Save ``array`` at ``cache_path`` atomically, then prune the cache."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            np.save(f, array)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        return  # Read-only home or similar; the in-memory table still works
+    prune_tables()
+
+
+def prune_tables(limit=DISK_CACHE_BYTES):
+    """Delete the least recently used table files beyond ``limit`` bytes.
+
+    The most recently used file is always kept.
+    """
+    files = []
+    for pattern in TABLE_PATTERNS:
+        for path in CACHE_DIR.glob(pattern):
+            try:
+                files.append((path.stat(), path))
+            except FileNotFoundError:
+                pass  # Pruned by another process
+    files.sort(key=lambda item: item[0].st_mtime, reverse=True)
+    total = 0
+    for i, (stat, path) in enumerate(files):
+        total += stat.st_size
+        if i and total > limit:
+            path.unlink(missing_ok=True)
+
+
+@functools.lru_cache(maxsize=MEMORY_TABLES)
+def _cached_table(palette, threshold, metric):
+    cache_path = CACHE_DIR / f"bg-{palette_key(palette, threshold, metric)}.npy"
+    packed = load_table(cache_path)
+    if packed is not None:
+        return np.unpackbits(packed).view(bool)
+
+    table = build_table(palette, threshold, metric)
+    store_table(cache_path, np.packbits(table))
+    return table
+
+
+def background_table(colors, threshold, metric=EUCLIDEAN):
+    """Return the compiled table for a palette, building it at most once."""
+    return _cached_table(tuple(palette_rgb(colors)), threshold, metric)
+
+
+def classify(rgba, table):
+    """Look up every pixel of an (H, W, 4) uint8 array in ``table``.
+
+    Reinterprets each RGBA pixel as a little-endian uint32 so the table
+    index is just the low 24 bits; no per-channel arithmetic needed.
+    """
+    packed = np.ascontiguousarray(rgba).view('<u4')[..., 0]
+    return table[packed & 0xFFFFFF]
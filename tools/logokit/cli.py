@@ -0,0 +1,55 @@
+"""
+The ``logo`` command line.
+
+Only argparse is imported up front. Each subcommand lives in its own
+module, exposing ``add_arguments(parser)`` and ``run(parser, args)``, and
+is imported only once it has been chosen, so ``logo verify`` never loads
+PIL or NumPy. Commands that add timing.add_profile_arguments() get
+``--profile`` handled here, around their ``run``.
+"""
+
+import argparse
+import importlib
+
+# Subcommand -> (module, one-line help)
+COMMANDS = {
+    'analyze': ('logokit.report', "report transparency and content stats for every export"),
+    'strip': ('logokit.strip', "make the icon exports' backgrounds transparent"),
+    'pack': ('logokit.pack', "assemble the transparent / on-dark / mono asset pack"),
+    'variants': ('logokit.variants', "derive mono / tinted / inverted variants from one master"),
+    'verify': ('logokit.verify', "check the logo files the app ships"),
+    'sync': ('logokit.sync', "copy the processed exports into the frontend"),
+    'watch': ('logokit.watch', "reprocess exports as they change, until interrupted"),
+}
+
+
+def main(argv=None):
+    """Run the ``logo`` CLI; returns the process exit status."""
+    parser = argparse.ArgumentParser(
+        prog='logo', description="Logo asset tools for the Icebreaker app.",
+    )
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND', required=True)
+    for name, (_, help_text) in COMMANDS.items():
+        # Options are parsed by the subcommand's own parser below
+        subparsers.add_parser(name, help=help_text, add_help=False)
+    args, rest = parser.parse_known_args(argv)
+
+    module_name, help_text = COMMANDS[args.command]
+    module = importlib.import_module(module_name)
+    command_parser = argparse.ArgumentParser(
+        prog=f"logo {args.command}", description=module.__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    module.add_arguments(command_parser)
+    command_args = command_parser.parse_args(rest)
+    if getattr(command_args, 'trace', False) and not command_args.profile:
+        command_parser.error("--trace needs --profile FILE")
+    if not (getattr(command_args, 'profile', None) or getattr(command_args, 'cprofile', None)):
+        return module.run(command_parser, command_args)
+
+    timing = importlib.import_module('logokit.timing')
+    timing.start(cprofile=bool(command_args.cprofile))
+    try:
+        return module.run(command_parser, command_args)
+    finally:
+        timing.finish(command_args.profile, command_args.trace, command_args.cprofile)
@@ -0,0 +1,92 @@
+"""
+Pixel-level comparison of two logo files.
+
+Equal bytes are equal images, so the comparison starts with a content
+hash and only decodes when the hashes differ. Decoded images are compared
+as RGBA arrays: a pixel counts as changed when any channel moves by more
+than ``tolerance``, except that two fully transparent pixels are equal
+whatever their hidden RGB. ICOs are compared frame by frame.
+"""
+
+import numpy as np
+from PIL import Image
+
+from .manifest import file_hash
+
+
+def _frames(path):
+    """Map each frame size of a PNG or ICO to its RGBA image."""
+    img = Image.open(path)
+    if img.format == 'ICO':
+        return {size: img.ico.getimage(size).convert('RGBA') for size in img.ico.sizes()}
+    return {img.size: img.convert('RGBA')}
+
+
+def compare_images(a, b, tolerance=0):
+    """Compare two images of the same size.
+
+    Returns ``(changed, bbox)``: the number of changed pixels and the
+    (left, top, right, bottom) box around them, or None if none changed.
+    """
+    a = np.asarray(a.convert('RGBA'), dtype=np.int16)
+    b = np.asarray(b.convert('RGBA'), dtype=np.int16)
+    changed = np.abs(a - b).max(axis=2) > tolerance
+    changed &= (a[..., 3] != 0) | (b[..., 3] != 0)
+
+    count = int(np.count_nonzero(changed))
+    if not count:
+        return 0, None
+    rows = np.flatnonzero(changed.any(axis=1))
+    cols = np.flatnonzero(changed.any(axis=0))
+    return count, (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1)
+
+
+def compare_files(path_a, path_b, tolerance=0):
+    """Compare two image files, decoding them only if their bytes differ.
+
+    Returns a dict with:
+      identical  same bytes (nothing was decoded)
+      frames     per frame size: {'size', 'changed', 'total', 'bbox'};
+                 a frame only one file has counts as entirely changed
+      changed    changed pixels over all frames
+      fraction   changed share of all compared pixels
+    """
+    if file_hash(path_a) == file_hash(path_b):
+        return {'identical': True, 'frames': [], 'changed': 0, 'fraction': 0.0}
+
+    frames_a, frames_b = _frames(path_a), _frames(path_b)
+    frames = []
+    for size in sorted(frames_a.keys() | frames_b.keys()):
+        total = size[0] * size[1]
+        if size in frames_a and size in frames_b:
+            changed, bbox = compare_images(frames_a[size], frames_b[size], tolerance)
+        else:
+            changed, bbox = total, (0, 0, *size)
+        frames.append({'size': size, 'changed': changed, 'total': total, 'bbox': bbox})
+
+    changed = sum(f['changed'] for f in frames)
+    total = sum(f['total'] for f in frames)
+    return {
+        'identical': False,
+        'frames': frames,
+        'changed': changed,
+        'fraction': changed / total if total else 0.0,
+    }
+
+
+def describe(diff):
+    """One-line summary of a compare_files() result."""
+    if diff['identical']:
+        return "identical"
+    if not diff['changed']:
+        return "same pixels, different encoding"
+
+    parts = []
+    for frame in diff['frames']:
+        if not frame['changed']:
+            continue
+        width, height = frame['size']
+        box = ",".join(str(v) for v in frame['bbox'])
+        parts.append(f"{width}x{height}: {frame['changed']} px "
+                     f"({frame['changed'] / frame['total'] * 100:.2f}%) in {box}")
+    return "; ".join(parts)
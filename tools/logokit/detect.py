@@ -0,0 +1,188 @@
+"""
+Background palette detection from an image's border.
+
+BACKGROUND_COLORS is a fixed list, so every new export shade needs a code
+edit. A flat background shows up all along the border, though, so the
+palette can be read off the outermost BORDER pixels alone, O(perimeter)
+rather than O(area):
+
+* opaque border samples are counted by exact color;
+* colors are clustered greedily, most common first: a color within
+  THRESHOLD of a cluster's seed joins it, otherwise it seeds a new one;
+* clusters holding less than MIN_SHARE of the samples are artwork that
+  touches the edge, not background, and are dropped, as are clusters
+  further than MAX_DRIFT from every BACKGROUND_COLORS entry: a white mono
+  logo or the teal maskable fill is artwork too, not a new navy shade;
+* each cluster's tolerance is THRESHOLD plus the spread (95th percentile
+  distance) of its samples around the seed, so a noisy or dithered
+  background still matches whole while a few anti-aliased edge pixels
+  don't widen it. The spread is rounded up to a multiple of
+  TOLERANCE_STEP, so files share a few tolerances, and with them the
+  compiled tables (see classifier.py), instead of one each.
+
+The result is stored in a hidden sidecar next to the image, keyed by the
+file's hash, so an image is only sampled the first time. When the image
+is then stripped in place, the stripped file's hash is added too: its
+border is transparent by then and couldn't be detected again.
+"""
+
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+
+from .atomic import write_atomic
+from .engine import BACKGROUND_COLORS, THRESHOLD
+from .manifest import file_hash
+
+# Bump when detection changes, so old sidecars are ignored
+DETECT_VERSION = 2
+
+# Border depth sampled, in pixels
+BORDER = 2
+
+# Smallest share of the border samples a cluster needs to count as background
+MIN_SHARE = 0.05
+
+# Furthest a detected background may be from the brand background colors
+MAX_DRIFT = 4 * THRESHOLD
+
+# Share of a cluster's samples its tolerance must cover
+SPREAD_QUANTILE = 0.95
+
+# Detected tolerances are THRESHOLD plus a multiple of this
+TOLERANCE_STEP = 5
+
+
+def border_ring(rgba):
+    """RGBA pixels of the outer BORDER rows and columns of an RGBA array, as (N, 4)."""
+    height, width = rgba.shape[:2]
+    depth = min(BORDER, height // 2 or 1, width // 2 or 1)
+    return np.concatenate([
+        rgba[:depth].reshape(-1, 4),
+        rgba[height - depth:].reshape(-1, 4),
+        rgba[depth:height - depth, :depth].reshape(-1, 4),
+        rgba[depth:height - depth, width - depth:].reshape(-1, 4),
+    ])
+
+
+def border_samples(rgba):
+    """Opaque RGB samples from the border ring of an RGBA array."""
+    ring = border_ring(rgba)
+    return ring[ring[:, 3] == 255, :3]
+
+
+def _spread(distances, counts):
+    """Count-weighted SPREAD_QUANTILE of member distances from the seed."""
+    order = np.argsort(distances)
+    covered = np.cumsum(np.asarray(counts)[order])
+    index = np.searchsorted(covered, SPREAD_QUANTILE * covered[-1])
+    return np.asarray(distances)[order][index]
+
+
+def cluster_colors(samples, merge=THRESHOLD, min_share=MIN_SHARE, reference=BACKGROUND_COLORS):
+    """Cluster RGB samples into ``[(color, tolerance)]``, largest cluster first.
+
+    Only clusters within MAX_DRIFT of a ``reference`` color are returned.
+    """
+    if not len(samples):
+        return []
+    colors, counts = np.unique(samples, axis=0, return_counts=True)
+    order = np.argsort(-counts, kind='stable')
+    colors, counts = colors[order].astype(np.int32), counts[order]
+
+    # seed, member distances from the seed, member counts
+    clusters = []
+    for color, count in zip(colors, counts):
+        for seed, distances, members in clusters:
+            distance = math.dist(color, seed)
+            if distance <= merge:
+                distances.append(distance)
+                members.append(int(count))
+                break
+        else:
+            clusters.append((color, [0.0], [int(count)]))
+
+    total = int(counts.sum())
+    detected = []
+    for seed, distances, members in clusters:
+        if sum(members) < min_share * total:
+            continue
+        if min(math.dist(seed, color[:3]) for color in reference) > MAX_DRIFT:
+            continue
+        steps = math.ceil(_spread(distances, members) / TOLERANCE_STEP)
+        tolerance = THRESHOLD + TOLERANCE_STEP * steps
+        detected.append((tuple(int(c) for c in seed), tolerance))
+    return detected
+
+
+def detect_palette(img):
+    """Detect the background palette of a PIL image from its border.
+
+    Returns ``(colors, thresholds)``: RGB tuples and one matching distance
+    each, as taken by strip_background(). Both are empty when the border
+    has no opaque background (e.g. the image is already transparent).
+    """
+    rgba = np.asarray(img if img.mode == 'RGBA' else img.convert('RGBA'))
+    clusters = cluster_colors(border_samples(rgba))
+    return [color for color, _ in clusters], [tolerance for _, tolerance in clusters]
+
+
+def sidecar_path(path):
+    """The hidden palette sidecar for an image, e.g. ``.ios_1024.png.palette.json``."""
+    path = Path(path)
+    return path.with_name(f".{path.name}.palette.json")
+
+
+def _read_sidecar(path):
+    try:
+        data = json.loads(sidecar_path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    return data if data.get('version') == DETECT_VERSION else None
+
+
+def _write_sidecar(path, colors, thresholds, hashes):
+    data = {
+        'version': DETECT_VERSION,
+        'hashes': hashes,
+        'colors': [list(color) for color in colors],
+        'thresholds': thresholds,
+    }
+    write_atomic(sidecar_path(path), (json.dumps(data, indent=2) + '\n').encode('utf-8'))
+
+
+def cached_palette(path):
+    """The sidecar palette for ``path`` as it is now, or None if not detected yet."""
+    data = _read_sidecar(path)
+    if data is None or file_hash(path) not in data['hashes']:
+        return None
+    return [tuple(color) for color in data['colors']], data['thresholds']
+
+
+def palette_for(path, img):
+    """The background palette of ``path`` (decoded as ``img``), detecting it once."""
+    cached = cached_palette(path)
+    if cached is not None:
+        return cached
+    colors, thresholds = detect_palette(img)
+    _write_sidecar(path, colors, thresholds, [file_hash(path)])
+    return colors, thresholds
+
+
+def keep_palette(path):
+    """After rewriting ``path`` in place, keep its sidecar valid for the new contents."""
+    data = _read_sidecar(path)
+    if data is None:
+        return
+    output_hash = file_hash(path)
+    if output_hash not in data['hashes']:
+        _write_sidecar(path, data['colors'], data['thresholds'], data['hashes'] + [output_hash])
+
+
+def describe_palette(colors, thresholds):
+    """Short text form of a palette, e.g. ``#0A0F1F±25``."""
+    if not colors:
+        return "no background"
+    return ", ".join(f"#{r:02X}{g:02X}{b:02X}±{t}" for (r, g, b), t in zip(colors, thresholds))
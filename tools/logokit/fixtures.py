@@ -0,0 +1,68 @@
+"""
+Deterministic synthetic logo fixtures.
+
+A fresh checkout has no Docs/Vision exports, so anything that needs sample
+artwork draws its own: a brand-navy field with a charcoal rounded tile and
+a teal (#00B8D9) ring and dot, all with anti-aliased edges. A given size
+always produces exactly the same pixels.
+"""
+
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Bump when the drawing changes so cached fixture files are regenerated
+FIXTURE_VERSION = 1
+
+NAVY = (10, 15, 31)       # #0A0F1F
+CHARCOAL = (13, 13, 13)   # #0D0D0D
+TEAL = (0, 184, 217)      # #00B8D9
+
+FIXTURE_SIZES = (16, 64, 256, 1024, 4096, 8192)
+
+# Pixels of float work per strip, to keep 8192px fixtures out of swap
+STRIP_PIXELS = 1 << 20
+
+
+def _coverage(distance):
+    """Pixel coverage from a signed distance in pixels (negative inside)."""
+    return np.clip(0.5 - distance, 0.0, 1.0)[..., None]
+
+
+def render_fixture(size):
+    """Draw the ``size`` x ``size`` RGB fixture."""
+    out = np.empty((size, size, 3), dtype=np.uint8)
+    navy, charcoal, teal = (np.array(c, dtype=np.float32) for c in (NAVY, CHARCOAL, TEAL))
+    center = size / 2
+    xs = np.arange(size, dtype=np.float32) + 0.5 - center
+    strip = max(1, STRIP_PIXELS // size)
+
+    for top in range(0, size, strip):
+        ys = np.arange(top, min(top + strip, size), dtype=np.float32)[:, None] + 0.5 - center
+        radius = np.hypot(xs[None, :], ys)
+
+        # Rounded-square tile
+        half, corner = 0.42 * size, 0.12 * size
+        qx = np.abs(xs)[None, :] - (half - corner)
+        qy = np.abs(ys) - (half - corner)
+        tile = (np.hypot(np.maximum(qx, 0), np.maximum(qy, 0))
+                + np.minimum(np.maximum(qx, qy), 0) - corner)
+
+        # Ring plus center dot
+        mark = np.minimum(np.abs(radius - 0.28 * size) - 0.05 * size, radius - 0.09 * size)
+
+        pixels = navy + (charcoal - navy) * _coverage(tile)
+        pixels += (teal - pixels) * _coverage(mark)
+        out[top:top + len(ys)] = np.rint(pixels).astype(np.uint8)
+    return Image.fromarray(out, 'RGB')
+
+
+def fixture_path(directory, size):
+    """Path of the ``size`` fixture in ``directory``, drawing it if missing."""
+    path = Path(directory) / f"fixture-v{FIXTURE_VERSION}-{size}.png"
+    if not path.exists():
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        render_fixture(size).save(tmp_path, 'PNG', compress_level=1)
+        tmp_path.replace(path)
+    return path
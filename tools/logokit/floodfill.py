@@ -0,0 +1,83 @@
+"""
+Border-connected background regions.
+
+Global color matching also clears interior details that happen to be
+navy. Connected mode keeps only the background region reachable from the
+image border: the candidate mask is split into horizontal runs, runs that
+touch between adjacent rows (4-connectivity) are merged into components,
+and only components touching an edge are kept. Everything is array work
+over runs, not pixels, so it costs about the same as the color match.
+"""
+
+import numpy as np
+
+
+def _runs(mask):
+    """Return (rows, starts, ends) of the True runs in each row, row-major."""
+    h, w = mask.shape
+    padded = np.zeros((h, w + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    steps = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(steps == 1)
+    _, ends = np.nonzero(steps == -1)
+    return rows, starts, ends
+
+
+def _touching_runs(rows, starts, ends, width):
+    """Edges (a, b) between runs in adjacent rows that share a column."""
+    stride = width + 1
+    start_keys = rows * stride + starts
+    end_keys = rows * stride + ends
+
+    # For run b, the overlapping runs a in the row above are a contiguous
+    # range: a.end > b.start and a.start < b.end
+    above = (rows - 1) * stride
+    lo = np.searchsorted(end_keys, above + starts, side='right')
+    hi = np.searchsorted(start_keys, above + ends, side='left')
+    counts = np.maximum(hi - lo, 0)
+
+    b = np.repeat(np.arange(len(rows)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    a = np.repeat(lo, counts) + offsets
+    return a, b
+
+
+def _components(count, a, b):
+    """Label the connected components of a graph given as edge arrays.
+
+    Hooks the larger root of every edge onto the smaller one, then
+    compresses paths by pointer jumping, until no edge spans two labels.
+    """
+    labels = np.arange(count)
+    while True:
+        la, lb = labels[a], labels[b]
+        low = np.minimum(la, lb)
+        hooked = labels.copy()
+        np.minimum.at(hooked, la, low)
+        np.minimum.at(hooked, lb, low)
+        while True:
+            jumped = hooked[hooked]
+            if np.array_equal(jumped, hooked):
+                break
+            hooked = jumped
+        if np.array_equal(hooked, labels):
+            return labels
+        labels = hooked
+
+
+def border_connected(mask):
+    """Return the part of boolean ``mask`` connected to the image border."""
+    h, w = mask.shape
+    rows, starts, ends = _runs(mask)
+    if not len(rows):
+        return np.zeros_like(mask, dtype=bool)
+
+    labels = _components(len(rows), *_touching_runs(rows, starts, ends, w))
+    on_border = (rows == 0) | (rows == h - 1) | (starts == 0) | (ends == w)
+    keep = np.isin(labels, labels[on_border])
+
+    # Paint the kept runs back as +1/-1 steps and integrate along each row
+    steps = np.zeros((h, w + 1), dtype=np.int32)
+    np.add.at(steps, (rows[keep], starts[keep]), 1)
+    np.add.at(steps, (rows[keep], ends[keep]), -1)
+    return np.cumsum(steps[:, :w], axis=1) > 0
@@ -0,0 +1,64 @@
+"""
+Multi-resolution favicon.ico builder.
+
+Packs the processed favicon_*.png buffers into one ICO. Frames embed the
+PNG bytes exactly as they are (no decode, no re-encode). Sizes passed as
+``bmp_sizes`` are written as 32-bit BMP for legacy readers instead, decoded
+from the in-memory buffer rather than from disk; none are by default, since
+every reader since Windows Vista shows PNG frames and a BMP frame is two
+to three times the size of its PNG.
+"""
+
+import io
+import struct
+
+import numpy as np
+from PIL import Image
+
+# The frames the design export's favicon.ico has; browsers pick 16 or 32,
+# and Windows shortcuts up to 64 (favicon_128.png is for the frontend logo)
+FAVICON_SIZES = (16, 32, 48, 64)
+
+# Frames to store as BMP for pre-Vista readers that can't show PNG frames
+BMP_SIZES = ()
+
+
+def _png_size(data):
+    """Width and height from a PNG buffer's IHDR."""
+    return struct.unpack('>II', data[16:24])
+
+
+def _bmp_frame(data):
+    """Encode a PNG buffer as an ICO BMP frame (BGRA + AND mask, bottom-up)."""
+    img = Image.open(io.BytesIO(data)).convert('RGBA')
+    width, height = img.size
+    header = struct.pack('<IiiHHIIiiII', 40, width, height * 2, 1, 32, 0, 0, 0, 0, 0, 0)
+    pixels = img.tobytes('raw', 'BGRA', 0, -1)
+
+    # AND mask: 1 bit per pixel, set where fully transparent, rows padded to 32 bits
+    transparent = np.asarray(img)[::-1, :, 3] == 0
+    padded = np.zeros((height, -(-width // 32) * 32), dtype=bool)
+    padded[:, :width] = transparent
+    return header + pixels + np.packbits(padded, axis=1).tobytes()
+
+
+def build_ico(frames, bmp_sizes=BMP_SIZES):
+    """Return ICO bytes for ``frames``, an iterable of PNG buffers.
+
+    Frames are ordered by size; sizes in ``bmp_sizes`` become BMP frames,
+    the rest are embedded as PNG.
+    """
+    entries = []
+    for data in sorted(frames, key=_png_size):
+        width, height = _png_size(data)
+        payload = _bmp_frame(data) if width in bmp_sizes and width == height else data
+        entries.append((width, height, payload))
+
+    offset = 6 + 16 * len(entries)
+    out = [struct.pack('<HHH', 0, 1, len(entries))]
+    for width, height, payload in entries:
+        out.append(struct.pack('<BBBBHHII', width % 256, height % 256, 0, 0, 1, 32,
+                               len(payload), offset))
+        offset += len(payload)
+    out.extend(payload for _, _, payload in entries)
+    return b''.join(out)
@@ -0,0 +1,178 @@
+"""
+One-scan index of an asset directory.
+
+Each command used to find its files its own way: a glob per category
+pattern, an exists() per name of a hand-written list, more globs for the
+total. An AssetIndex lists a directory once with os.scandir() and
+classifies every name against all CATEGORIES with one compiled regex (the
+category globs translated and joined as named alternatives), so a name's
+category, and which of its patterns matched, is a single match whatever
+the number of patterns.
+
+Everything else about a file is read on first use and kept: its size
+from the scan, format, dimensions and transparency from its headers (see
+probe.py; no decode) and its content hash. Commands build one index per
+directory and run; outputs written during the run are added back, so
+later lookups see them without scanning again.
+
+Like probe.py, this module doesn't import PIL or NumPy.
+"""
+
+import fnmatch
+import os
+import re
+from functools import cached_property
+from pathlib import Path
+
+from .manifest import file_hash
+from .probe import probe
+
+ICON_ONLY = "Icon Only (transparent)"
+SPECIAL = "Special"
+
+# Category -> filename patterns, in display order. The categories are
+# disjoint: a file belongs to at most one.
+CATEGORIES = {
+    ICON_ONLY: [
+        "favicon_*.png", "ios_*.png", "android_[0-9]*.png", "pwa_*.png",
+        "maskable_icon_*.png", "splash_logo_*.png", "logo-icon-*.png"
+    ],
+    "Logo + Wordmark (transparent)": ["logo-with-title-[0-9]*.png"],
+    "Logo + Wordmark (on dark bg)": ["logo-with-title-on-dark-*.png"],
+    "Monochrome (transparent)": ["mono_black.png", "mono_white.png"],
+    SPECIAL: ["android_adaptive_*.png", "favicon.ico"]
+}
+
+
+def category_matcher(categories=CATEGORIES):
+    """Compile ``categories`` into a single ``match(name)``.
+
+    ``match`` returns ``(category, rank)``, where rank is the position of
+    the matching pattern among all of them, or ``(None, None)``.
+    """
+    patterns = [(category, pattern) for category, group in categories.items() for pattern in group]
+    regex = re.compile('|'.join(
+        f"(?P<p{rank}>{fnmatch.translate(pattern)})" for rank, (_, pattern) in enumerate(patterns)
+    ))
+
+    def match(name):
+        found = regex.match(name)
+        if not found:
+            return None, None
+        rank = int(found.lastgroup[1:])
+        return patterns[rank][0], rank
+    return match
+
+
+_match = category_matcher()
+
+
+def classify(name):
+    """The CATEGORIES entry ``name`` belongs to, or None."""
+    return _match(name)[0]
+
+
+class Asset:
+    """One indexed file. Stat, header probe and hash are each read at most once."""
+
+    def __init__(self, path, category=None, rank=None, entry=None):
+        self.path = Path(path)
+        self.name = self.path.name
+        self.category = category
+        self.rank = rank
+        self._entry = entry
+
+    @cached_property
+    def stat(self):
+        return self._entry.stat() if self._entry is not None else self.path.stat()
+
+    @property
+    def size(self):
+        """File size in bytes."""
+        return self.stat.st_size
+
+    @cached_property
+    def info(self):
+        """probe.probe() of the file's headers, or None if it isn't a PNG or ICO."""
+        try:
+            return probe(self.path)
+        except (OSError, ValueError):
+            return None
+
+    @property
+    def dimensions(self):
+        """(width, height) from the headers (an ICO's largest frame), or None."""
+        return self.info['size'] if self.info else None
+
+    @cached_property
+    def hash(self):
+        """SHA-256 of the contents (see manifest.file_hash)."""
+        return file_hash(self.path)
+
+
+class AssetIndex:
+    """One os.scandir() of a directory, classified against ``categories``.
+
+    A missing directory gives an empty index.
+    """
+
+    def __init__(self, directory, categories=CATEGORIES):
+        self.directory = Path(directory)
+        self.categories = categories
+        self.match_category = _match if categories is CATEGORIES else category_matcher(categories)
+        self.assets = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        self.assets[entry.name] = Asset(
+                            entry.path, *self.match_category(entry.name), entry=entry
+                        )
+        except FileNotFoundError:
+            pass
+
+    def __contains__(self, name):
+        return name in self.assets
+
+    def __len__(self):
+        return len(self.assets)
+
+    def __iter__(self):
+        """The Assets, sorted by name."""
+        return iter(sorted(self.assets.values(), key=lambda asset: asset.name))
+
+    def get(self, name):
+        """The Asset for ``name``, or None if it isn't in the directory."""
+        return self.assets.get(name)
+
+    def add(self, path):
+        """Index a file written after the scan; replaces any stale entry."""
+        name = Path(path).name
+        self.assets[name] = Asset(self.directory / name, *self.match_category(name))
+
+    def match(self, pattern):
+        """Sorted names matching a glob ``pattern``."""
+        return sorted(name for name in self.assets if fnmatch.fnmatch(name, pattern))
+
+    def files(self, pattern):
+        """Sorted Assets whose names match a glob ``pattern``."""
+        return [self.assets[name] for name in self.match(pattern)]
+
+    def existing(self, names):
+        """The ``names`` present in the directory, in the given order."""
+        return [name for name in names if name in self.assets]
+
+    def by_category(self):
+        """``{category: names}`` for every category, in display order.
+
+        Names are grouped by the pattern they matched, in pattern order,
+        and sorted within each.
+        """
+        grouped = {category: [] for category in self.categories}
+        for asset in sorted(self.assets.values(), key=lambda asset: (asset.rank or 0, asset.name)):
+            if asset.category is not None:
+                grouped[asset.category].append(asset.name)
+        return grouped
+
+    def path(self, name):
+        return self.directory / name
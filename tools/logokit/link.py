@@ -0,0 +1,115 @@
+"""
+Zero-copy materialization of synced files.
+
+The frontend copies are byte-for-byte the exports they come from, so they
+needn't cost a copy each. link_atomic() puts ``source``'s content at
+``dest`` the cheapest way the filesystem allows, through the same
+temp-file, verify and rename path as every other write (see atomic.py):
+
+* reflink (FICLONE): a copy-on-write clone on btrfs, XFS and the like;
+  independent files that share storage until one is modified;
+* copy: a full byte copy, always possible;
+* hardlink: a second name for the same inode, on any local filesystem.
+
+``--link`` (or LOGO_LINK) picks one; ``auto``, the default, tries a
+reflink and falls back to a copy. Hardlinks are opt-in only: a hardlinked
+frontend file *is* the export, so anything that writes either in place
+(``cp``, an editor) changes both, including a git-tracked frontend copy.
+A hardlink left by ``--link hardlink`` is replaced by an independent file
+on the next sync in any other mode (see stray_hardlink()).
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from .atomic import _batched, _commit, _temp_path, copy_atomic
+
+LINK_ENV = 'LOGO_LINK'
+AUTO = 'auto'
+REFLINK = 'reflink'
+HARDLINK = 'hardlink'
+COPY = 'copy'
+
+# ioctl(dest_fd, FICLONE, src_fd), from linux/fs.h
+FICLONE = 0x40049409
+
+
+def set_link_mode(mode):
+    """Select AUTO or one method; worker processes inherit it through the environment."""
+    os.environ[LINK_ENV] = mode
+
+
+def _methods():
+    mode = os.environ.get(LINK_ENV, AUTO)
+    return (REFLINK, COPY) if mode == AUTO else (mode,)
+
+
+def _same_file(source, dest):
+    try:
+        return os.path.samefile(source, dest)
+    except FileNotFoundError:
+        return False
+
+
+def stray_hardlink(source, dest):
+    """True if ``dest`` is a hardlink to ``source`` but the link mode forbids hardlinks."""
+    return HARDLINK not in _methods() and _same_file(source, dest)
+
+
+def _reflink(source, tmp_path):
+    if fcntl is None:
+        raise OSError("reflinks need fcntl")
+    with open(source, 'rb') as src, open(tmp_path, 'xb') as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        if not _batched():
+            os.fsync(dst.fileno())
+    shutil.copystat(source, tmp_path)
+
+
+def _hardlink(source, tmp_path):
+    os.link(source, tmp_path)
+
+
+def link_atomic(source, dest):
+    """Atomically make ``dest`` hold ``source``'s content; returns the method used.
+
+    Falls back along the methods allowed by the link mode, and raises
+    only when the last of them fails.
+    """
+    dest = Path(dest)
+    methods = _methods()
+    if HARDLINK in methods and _same_file(source, dest):
+        return HARDLINK  # Already linked; renaming onto it would be a no-op
+
+    for method in methods:
+        if method == COPY:
+            copy_atomic(source, dest)
+            return COPY
+
+        tmp_path = _temp_path(dest)
+        try:
+            (_reflink if method == REFLINK else _hardlink)(source, tmp_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            if method == methods[-1]:
+                raise
+            continue  # Not supported here (other filesystem, no reflinks, ...)
+        _commit(tmp_path, dest)
+        return method
+
+
+def add_link_argument(parser):
+    """Add the shared ``--link`` option to an argparse parser."""
+    parser.add_argument(
+        '--link', choices=[AUTO, REFLINK, HARDLINK, COPY],
+        default=os.environ.get(LINK_ENV, AUTO),
+        help="how frontend copies are made: reflink, copy or hardlink (shares the "
+             "export's inode, so in-place writes hit both); auto tries a reflink, "
+             "then copies (default: auto)",
+    )
@@ -0,0 +1,110 @@
+"""
+Content-hash manifest so unchanged logo assets are skipped on re-run.
+
+``.logo-cache.json`` lives next to LOGO_DIR and records, for every output
+file, the hash of its source, the parameters it was produced with and the
+hash of the output itself. A step whose source, parameters and output all
+still match is a no-op: nothing is decoded, rewritten or re-copied, and
+mtimes stay put.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from .atomic import copy_atomic, write_atomic
+
+MANIFEST_NAME = '.logo-cache.json'
+MANIFEST_VERSION = 1
+
+# Parameters recorded for plain file copies
+COPY_PARAMS = {'op': 'copy'}
+
+
+def file_hash(path):
+    """SHA-256 of a file's contents, or None if it doesn't exist."""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+class Manifest:
+    """Output -> (source hash, params, output hash) records, stored as JSON."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+        self.dirty = False
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+            if data.get('version') == MANIFEST_VERSION:
+                self.entries = data.get('entries', {})
+        except (OSError, ValueError):
+            pass  # Missing or unreadable manifest: everything is stale
+
+    @classmethod
+    def for_logo_dir(cls, logo_dir):
+        """Open the manifest that sits next to ``logo_dir``."""
+        return cls(Path(logo_dir).parent / MANIFEST_NAME)
+
+    @staticmethod
+    def _key(path):
+        return Path(path).as_posix()
+
+    def is_fresh(self, output, source, params):
+        """True if ``output`` was built from ``source`` as-is with ``params``.
+
+        ``source`` and ``output`` may be the same path for in-place steps.
+        """
+        entry = self.entries.get(self._key(output))
+        if not entry or entry.get('source') != self._key(source):
+            return False
+        if entry.get('params') != params:
+            return False
+
+        output_hash = file_hash(output)
+        if output_hash is None or output_hash != entry.get('output_hash'):
+            return False
+        source_hash = output_hash if Path(source) == Path(output) else file_hash(source)
+        return source_hash == entry.get('source_hash')
+
+    def record(self, output, source, params):
+        """Record ``output`` as freshly built from ``source`` with ``params``.
+
+        Call after the output is written. For in-place steps the recorded
+        source hash is the output hash, so the next run sees it as fresh.
+        """
+        output_hash = file_hash(output)
+        source_hash = output_hash if Path(source) == Path(output) else file_hash(source)
+        self.entries[self._key(output)] = {
+            'source': self._key(source),
+            'source_hash': source_hash,
+            'params': params,
+            'output_hash': output_hash,
+        }
+        self.dirty = True
+
+    def save(self):
+        """Write the manifest back if anything was recorded."""
+        if not self.dirty:
+            return
+        data = {'version': MANIFEST_VERSION, 'entries': dict(sorted(self.entries.items()))}
+        write_atomic(self.path, (json.dumps(data, indent=2) + '\n').encode('utf-8'))
+        self.dirty = False
+
+
+def copy_if_changed(manifest, source, dest):
+    """Copy ``source`` to ``dest`` unless the manifest says it's current.
+
+    An untracked ``dest`` that already has the same bytes is just recorded.
+    Returns True if a copy was made.
+    """
+    if manifest.is_fresh(dest, source, COPY_PARAMS):
+        return False
+    copied = file_hash(dest) != file_hash(source)
+    if copied:
+        copy_atomic(source, dest)
+    manifest.record(dest, source, COPY_PARAMS)
+    return copied
@@ -0,0 +1,176 @@
+"""
+Lossless PNG optimization for shipped assets.
+
+Pillow writes each PNG in the image's own mode with default zlib settings
+and whatever ancillary chunks came with the source. With optimization on,
+the same pixels are re-encoded as small as possible within a time budget:
+
+- the smallest lossless color type: palette (PLTE + tRNS) when there are
+  at most 256 distinct RGBA colors, otherwise gray and/or no alpha where
+  the pixels allow it;
+- only IHDR, PLTE, tRNS, IDAT and IEND (text, gamma, ICC and EXIF chunks
+  are dropped);
+- a search over row filters and zlib level/strategy, cheapest settings
+  first, stopping once the budget is spent.
+
+Decoding the result gives exactly the input RGBA; Pillow's own encoding is
+kept if nothing beats it.
+"""
+
+import io
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from .atomic import atomic_open, write_atomic
+from .tiled import PNG_SIGNATURE, STRIP_BYTES, _chunk, _filter_rows
+from .timing import span
+
+# Seconds of encoding search per file when --optimize is given bare
+DEFAULT_BUDGET = 2.0
+
+# Row filters tried for each deflate setting: None is per-row adaptive,
+# 0-4 force one PNG filter
+FILTERS = (None, 0, 4, 1, 2, 3)
+
+# (zlib level, strategy) pairs, cheapest first: level 9 can take ten times
+# as long as level 6 on large smooth artwork for a few percent
+DEFLATE_SETTINGS = (
+    (9, zlib.Z_RLE),
+    (6, zlib.Z_FILTERED),
+    (6, zlib.Z_DEFAULT_STRATEGY),
+    (9, zlib.Z_FILTERED),
+    (9, zlib.Z_DEFAULT_STRATEGY),
+)
+
+
+def _palette(img, rgba):
+    """(index rows, PLTE, tRNS) if ``img`` has at most 256 colors, else None."""
+    colors = img.getcolors(256)
+    if colors is None:
+        return None
+
+    # Translucent entries first so tRNS can stop at the last one; then by use
+    colors.sort(key=lambda c: (c[1][3] == 255, -c[0]))
+    entries = np.array([color for _, color in colors], dtype=np.uint8)
+    keys = entries.view('<u4').ravel()
+    order = np.argsort(keys)
+    pixels = rgba.view('<u4')[..., 0]
+    indices = order[np.searchsorted(keys[order], pixels)].astype(np.uint8)
+
+    translucent = int(np.count_nonzero(entries[:, 3] < 255))
+    return indices, entries[:, :3].tobytes(), entries[:translucent, 3].tobytes()
+
+
+def _truecolor(rgba):
+    """(rows, color type) with gray and alpha dropped where lossless."""
+    opaque = bool((rgba[..., 3] == 255).all())
+    gray = bool(((rgba[..., 0] == rgba[..., 1]) & (rgba[..., 1] == rgba[..., 2])).all())
+    if gray:
+        return (rgba[..., 0], 0) if opaque else (rgba[..., [0, 3]], 4)
+    return (rgba[..., :3], 2) if opaque else (rgba, 6)
+
+
+def _idat(pixels, filter_type, level, strategy):
+    """Filter and deflate ``pixels`` (height x width x bpp) into IDAT data."""
+    height, width = pixels.shape[:2]
+    bpp = pixels.shape[2] if pixels.ndim == 3 else 1
+    rows = pixels.reshape(height, width * bpp)
+    strip = max(1, STRIP_BYTES // max(1, rows.shape[1]))
+
+    deflater = zlib.compressobj(level, zlib.DEFLATED, 15, 9, strategy)
+    prior = np.zeros(rows.shape[1], dtype=np.uint8)
+    out = []
+    for top in range(0, height, strip):
+        block = rows[top:top + strip]
+        out.append(deflater.compress(_filter_rows(block, prior, bpp, filter_type).tobytes()))
+        prior = block[-1]
+    out.append(deflater.flush())
+    return b''.join(out)
+
+
+def optimize_png(img, budget=DEFAULT_BUDGET):
+    """Return (smallest PNG bytes found for ``img``, Pillow's default size).
+
+    At least one encoding is always tried; further ones only while they
+    look likely to finish within ``budget`` seconds.
+    """
+    deadline = time.perf_counter() + budget
+    baseline = io.BytesIO()
+    img.save(baseline, 'PNG')
+    best = baseline.getvalue()
+
+    if img.mode != 'RGBA':
+        img = img.convert('RGBA')
+    rgba = np.ascontiguousarray(np.asarray(img))
+    height, width = rgba.shape[:2]
+
+    layouts = []
+    palette = _palette(img, rgba)
+    if palette is not None:
+        indices, plte, trns = palette
+        extra = _chunk(b'PLTE', plte) + (_chunk(b'tRNS', trns) if trns else b'')
+        layouts.append((indices, 3, extra))
+    pixels, color_type = _truecolor(rgba)
+    layouts.append((np.ascontiguousarray(pixels), color_type, b''))
+
+    tried = 0
+    elapsed = 0.0
+    for pixels, color_type, extra in layouts:
+        head = (PNG_SIGNATURE
+                + _chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0))
+                + extra)
+        for level, strategy in DEFLATE_SETTINGS:
+            for filter_type in FILTERS:
+                # Stop before a trial that would likely overrun the budget
+                start = time.perf_counter()
+                if tried and start + elapsed / tried > deadline:
+                    return best, len(baseline.getvalue())
+                data = head + _chunk(b'IDAT', _idat(pixels, filter_type, level, strategy)) \
+                    + _chunk(b'IEND', b'')
+                tried += 1
+                elapsed += time.perf_counter() - start
+                if len(data) < len(best):
+                    best = data
+    return best, len(baseline.getvalue())
+
+
+def save_png(img, path, optimize=None):
+    """Save ``img`` as a PNG at ``path``, atomically (see atomic.py).
+
+    ``optimize`` is a time budget in seconds for optimize_png(); None keeps
+    Pillow's default encoding. Returns the bytes saved against that
+    default, or None when not optimizing.
+    """
+    with span('encode') as counters:
+        if optimize is None:
+            with atomic_open(path) as f:
+                img.save(f, 'PNG')
+                counters['bytes_written'] = f.tell()
+            return None
+        data, baseline_size = optimize_png(img, optimize)
+        write_atomic(path, data)
+        counters['bytes_written'] = len(data)
+        return baseline_size - len(data)
+
+
+def optimize_params(params, optimize):
+    """Manifest ``params`` for an output written with ``optimize``."""
+    return params if optimize is None else {**params, 'optimized': True}
+
+
+def saving_note(saved):
+    """Status-line suffix for save_png()'s result ('' when not optimizing)."""
+    return "" if saved is None else f" ({saved:,} bytes saved)"
+
+
+def add_optimize_argument(parser):
+    """Add the shared ``-O/--optimize`` option to an argparse parser."""
+    parser.add_argument(
+        '-O', '--optimize', nargs='?', type=float, const=DEFAULT_BUDGET, default=None,
+        metavar='SECONDS',
+        help="losslessly minimize written PNGs, searching encodings for up to "
+             f"SECONDS per file (default: {DEFAULT_BUDGET:g})",
+    )
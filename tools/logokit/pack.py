@@ -0,0 +1,190 @@
+"""
+``logo pack``: assemble the professional logo asset pack.
+
+- Icon-only: transparent background (all sizes)
+- Logo+wordmark: transparent AND on-dark versions
+- Icon-only crops of the logo+wordmark files (see split.py)
+- Monochrome: black and white variants on transparent
+
+Every source is read and decoded once: the -on-dark copy is written from
+the bytes already in memory and the transparent variant and icon crop
+from the decoded image (see pipeline.py). One directory index serves
+the whole run.
+"""
+
+from functools import partial
+
+from .atomic import add_fsync_argument, set_fsync_mode, sync_batch
+from .batch import add_workers_argument
+from .engine import BACKGROUND_COLORS, THRESHOLD, strip_params
+from .index import AssetIndex
+from .manifest import Manifest
+from .optimize import add_optimize_argument, optimize_params, saving_note
+from .paths import LOGO_DIR
+from .pipeline import Job, Output, run_pipeline, strip_stage, strip_stages
+from .split import split_params, split_stage
+from .timing import add_profile_arguments
+
+TITLE_PREFIX = "logo-with-title-"
+ON_DARK_PREFIX = "logo-with-title-on-dark-"
+# Icon-only crops, named after the logo-with-title size they are cut from
+ICON_PREFIX = "logo-icon-"
+
+MONO_FILES = ['mono_black.png', 'mono_white.png']
+
+def title_jobs(listing, params, connected):
+    """Jobs for the logo-with-title-* pairs.
+
+    The -on-dark file is the source of truth. On a first run it doesn't
+    exist yet, so the plain file is read, copied to -on-dark verbatim and
+    replaced by its transparent version in the same pass. Either way the
+    same decode also yields the logo-icon-* crop.
+    """
+    sizes = set()
+    for name in listing.match(f"{TITLE_PREFIX}*.png"):
+        if name.startswith(ON_DARK_PREFIX):
+            sizes.add(name[len(ON_DARK_PREFIX):-len(".png")])
+        elif "-transparent" not in name:
+            sizes.add(name[len(TITLE_PREFIX):-len(".png")])
+
+    stages = strip_stages(connected)
+    icon_stages = (partial(strip_stage, connected=connected), split_stage)
+    icon_params = split_params(params)
+    jobs = []
+    for size in sorted(sizes):
+        on_dark_path = listing.path(f"{ON_DARK_PREFIX}{size}.png")
+        transparent_path = listing.path(f"{TITLE_PREFIX}{size}.png")
+        icon_path = listing.path(f"{ICON_PREFIX}{size}.png")
+        if on_dark_path.name in listing:
+            jobs.append(Job(on_dark_path, [
+                Output(transparent_path, stages, params),
+                Output(icon_path, icon_stages, icon_params),
+            ]))
+        else:
+            jobs.append(Job(transparent_path, [
+                Output(on_dark_path),
+                Output(transparent_path, stages, params, record_source=on_dark_path),
+                Output(icon_path, icon_stages, icon_params, record_source=on_dark_path),
+            ]))
+    return jobs
+
+
+def is_icon(output):
+    return output.path.name.startswith(ICON_PREFIX)
+
+
+def mono_jobs(listing, params):
+    """Jobs making the mono files transparent in place, keeping an -on-dark backup."""
+    jobs = []
+    for filename in MONO_FILES:
+        if filename in listing:
+            filepath = listing.path(filename)
+            backup_path = listing.path(filename.replace('.png', '-on-dark.png'))
+            jobs.append(Job(filepath, [Output(backup_path), Output(filepath, strip_stages(), params)]))
+    return jobs
+
+
+def print_result(name, status, report):
+    if status == 'unchanged':
+        print(f"   ✓ {name}: unchanged")
+    elif status == 'error':
+        print(f"   ✗ {name}: ERROR - {report['error']}")
+    else:
+        print(f"   ✓ {name}: {report['removed']} pixels made transparent"
+              f"{saving_note(report['saved'])}")
+
+
+def _box(box):
+    return ",".join(str(v) for v in box) if box else "empty"
+
+
+def print_icon_result(name, status, report):
+    if status != 'written':
+        print_result(name, status, report)
+    elif report['wordmark'] is None:
+        print(f"   ✓ {name}: no wordmark found, whole logo used ({_box(report['mark'])})"
+              f"{saving_note(report['saved'])}")
+    else:
+        print(f"   ✓ {name}: mark {_box(report['mark'])}, wordmark {_box(report['wordmark'])}"
+              f"{saving_note(report['saved'])}")
+
+
+def add_arguments(parser):
+    add_workers_argument(parser)
+    add_optimize_argument(parser)
+    add_fsync_argument(parser)
+    add_profile_arguments(parser)
+    parser.add_argument(
+        '--match', choices=['global', 'connected'], default='connected',
+        help="how to strip logo-with-title-on-dark-* files: only background "
+             "connected to the border (default), or every background-colored pixel",
+    )
+
+
+def run(parser, args):
+    connected = args.match == 'connected'
+
+    print("=" * 70)
+    print("Creating Professional Logo Asset Pack")
+    print("=" * 70)
+
+    set_fsync_mode(args.fsync)
+    manifest = Manifest.for_logo_dir(LOGO_DIR)
+    listing = AssetIndex(LOGO_DIR)
+    params = optimize_params(strip_params(BACKGROUND_COLORS, THRESHOLD), args.optimize)
+    title_params = optimize_params(
+        strip_params(BACKGROUND_COLORS, THRESHOLD, connected=connected), args.optimize
+    )
+
+    titles = title_jobs(listing, title_params, connected)
+    monos = mono_jobs(listing, params)
+    results = list(run_pipeline(manifest, titles + monos, listing, args.workers, args.optimize))
+    manifest.save()
+    sync_batch()
+
+    # Step 1: -on-dark copies of the logo-with-title files
+    print("\n1. Organizing logo-with-title files...")
+    for job, output, status, report in results:
+        if job in titles and not output.stages and status != 'unchanged':
+            if status == 'error':
+                print(f"   ✗ {output.path.name}: ERROR - {report['error']}")
+            else:
+                print(f"   ✓ Created: {output.path.name}")
+
+    # Step 2: Transparent versions of logo-with-title
+    print("\n2. Creating transparent logo-with-title versions...")
+    for job, output, status, report in results:
+        if job in titles and output.stages and not is_icon(output):
+            print_result(output.path.name, status, report)
+
+    # Step 3: Icon-only crops, with the mark and wordmark bounds they were cut at
+    print("\n3. Cutting icon-only versions from logo-with-title...")
+    for job, output, status, report in results:
+        if job in titles and is_icon(output):
+            print_icon_result(output.path.name, status, report)
+
+    # Step 4: Mono versions made transparent (backups are written silently)
+    print("\n4. Processing monochrome versions...")
+    for job, output, status, report in results:
+        if job in monos and output.stages:
+            print_result(output.path.name, status, report)
+
+    # Step 5: Summary of final asset pack
+    print("\n" + "=" * 70)
+    print("FINAL ASSET PACK SUMMARY")
+    print("=" * 70)
+
+    print("\nFiles by category:")
+    for category, names in listing.by_category().items():
+        print(f"\n  {category}:")
+        for name in names:
+            print(f"    - {name}")
+
+    # Final count
+    total = len(listing.match("*.png")) + len(listing.match("*.ico"))
+    print(f"\n  TOTAL: {total} files")
+
+    print("\n" + "=" * 70)
+    print("Pro asset pack complete!")
+    print("=" * 70)
+    return 0
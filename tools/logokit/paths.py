@@ -0,0 +1,13 @@
+"""
+Default locations of the logo exports and the frontend copies.
+
+All paths are relative to the repo root, where the logo commands run.
+"""
+
+from pathlib import Path
+
+LOGO_DIR = Path("Docs/Vision/icebreaker_logo_exports")
+
+FRONTEND_ASSETS = Path("frontend/src/assets")
+FRONTEND_PUBLIC = Path("frontend/public")
+FRONTEND_INDEX = Path("frontend/index.html")
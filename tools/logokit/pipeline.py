@@ -0,0 +1,159 @@
+"""
+Declarative decode-once asset pipeline.
+
+A Job names one source file and the Outputs derived from it. Each output
+is either a verbatim copy of the source bytes or a chain of in-memory
+stages (strip, validate, ...) applied to the decoded source. A job reads
+its source once, decodes it at most once, and encodes each output once,
+so disk traffic follows the number of outputs rather than stages x files.
+
+Outputs with ``params`` are tracked in the manifest and skipped while
+fresh; copies are only written when their target is missing. The parent
+process decides what is stale and records results; jobs run through
+run_batch, so stages must be picklable (module-level functions or
+functools.partial over them).
+"""
+
+import io
+from functools import partial
+from pathlib import Path
+
+from PIL import Image
+
+from .atomic import write_atomic
+from .batch import run_batch
+from .engine import BACKGROUND_COLORS, THRESHOLD, strip_background
+from .optimize import save_png
+from .timing import span
+
+
+class Output:
+    """One file a job writes.
+
+    With no ``stages`` the source bytes are copied as-is, and only when
+    ``path`` doesn't exist yet. Otherwise the decoded source runs through
+    ``stages`` and is encoded to ``path``; ``params`` key it in the
+    manifest against ``record_source`` (default: the job's source).
+    """
+
+    def __init__(self, path, stages=(), params=None, record_source=None):
+        self.path = Path(path)
+        self.stages = tuple(stages)
+        self.params = params
+        self.record_source = record_source
+
+
+class Job:
+    """A source file and the outputs derived from it."""
+
+    def __init__(self, source, outputs):
+        self.source = Path(source)
+        self.outputs = list(outputs)
+
+
+def strip_stage(img, report, connected=False):
+    """Stage: make the brand background transparent."""
+    img, report['removed'] = strip_background(
+        img, BACKGROUND_COLORS, THRESHOLD, connected=connected
+    )
+    return img
+
+
+def validate_stage(img, report):
+    """Stage: the result must keep the source size and carry alpha."""
+    if img.size != report['source_size']:
+        raise ValueError(f"size changed from {report['source_size']} to {img.size}")
+    if img.mode != 'RGBA':
+        raise ValueError(f"expected RGBA output, got {img.mode}")
+    return img
+
+
+def strip_stages(connected=False):
+    """The strip + validate chain most outputs use."""
+    return (partial(strip_stage, connected=connected), validate_stage)
+
+
+def run_job(job, optimize=None):
+    """Write ``job``'s outputs; returns one (success, report) per output.
+
+    ``report`` holds what the stages recorded (e.g. 'removed') and
+    'saved' from save_png(), or 'error' when the output failed.
+    """
+    with span('file', job.source):
+        return _run_job(job, optimize)
+
+
+def _run_job(job, optimize):
+    try:
+        with span('read') as counters:
+            data = job.source.read_bytes()
+            counters['bytes_read'] = len(data)
+    except OSError as e:
+        return [(False, {'error': str(e)}) for _ in job.outputs]
+
+    decoded = None
+    staged = [output for output in job.outputs if output.stages]
+    results = []
+    for output in job.outputs:
+        report = {}
+        try:
+            if not output.stages:
+                with span('copy', bytes_written=len(data)):
+                    write_atomic(output.path, data)
+            else:
+                if decoded is None:
+                    with span('decode') as counters:
+                        decoded = Image.open(io.BytesIO(data))
+                        decoded.load()
+                        counters['pixels'] = decoded.width * decoded.height
+                # Stages may modify in place; only the last output gets the original
+                img = decoded if output is staged[-1] else decoded.copy()
+                report['source_size'] = decoded.size
+                for stage in output.stages:
+                    img = stage(img, report)
+                report['saved'] = save_png(img, output.path, optimize)
+            results.append((True, report))
+        except Exception as e:
+            results.append((False, {'error': str(e)}))
+    return results
+
+
+def is_stale(manifest, job, output):
+    """True if ``output`` of ``job`` needs writing."""
+    if not output.stages:
+        return not output.path.exists()
+    return not manifest.is_fresh(
+        output.path, output.record_source or job.source, output.params
+    )
+
+
+def run_pipeline(manifest, jobs, listing=None, workers=None, optimize=None):
+    """Run the stale outputs of ``jobs``; yields (job, output, status, report).
+
+    ``status`` is 'unchanged', 'written' or 'error'. Written outputs are
+    recorded in ``manifest`` (when they have params) and added to
+    ``listing`` (an index.AssetIndex).
+    """
+    pending = []
+    for job in jobs:
+        stale = [output for output in job.outputs if is_stale(manifest, job, output)]
+        pending.append(Job(job.source, stale))
+
+    results = run_batch(
+        run_job, [(job, optimize) for job in pending if job.outputs], workers
+    )
+    for job, todo in zip(jobs, pending):
+        done = dict(zip(map(id, todo.outputs), next(results))) if todo.outputs else {}
+        for output in job.outputs:
+            if id(output) not in done:
+                yield job, output, 'unchanged', {}
+                continue
+            success, report = done[id(output)]
+            if not success:
+                yield job, output, 'error', report
+                continue
+            if output.params is not None:
+                manifest.record(output.path, output.record_source or job.source, output.params)
+            if listing is not None:
+                listing.add(output.path)
+            yield job, output, 'written', report
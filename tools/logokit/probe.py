@@ -0,0 +1,101 @@
+"""
+Header-only image metadata probe.
+
+Size, mode and transparency of a PNG live in its IHDR chunk and whether a
+tRNS chunk precedes the image data; an ICO's frame sizes live in its
+directory. Reading just those bytes is enough for the verify scripts, so
+this module deliberately doesn't import PIL (or anything heavy).
+"""
+
+import struct
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+ICO_HEADER = b'\x00\x00\x01\x00'
+
+# PNG color type -> Pillow mode (gray depends on bit depth, see _png_mode)
+PNG_COLOR_MODES = {2: 'RGB', 3: 'P', 4: 'LA', 6: 'RGBA'}
+
+# Color types with an alpha channel of their own
+PNG_ALPHA_TYPES = (4, 6)
+
+
+def _png_mode(depth, color_type):
+    if color_type == 0:
+        return '1' if depth == 1 else 'I;16' if depth == 16 else 'L'
+    return PNG_COLOR_MODES[color_type]
+
+
+def _probe_png(f):
+    """Probe a PNG stream positioned just after its signature."""
+    length, ctype = struct.unpack('>I4s', f.read(8))
+    if ctype != b'IHDR':
+        raise ValueError("PNG without IHDR")
+    width, height, depth, color_type = struct.unpack('>IIBB', f.read(10))
+    f.seek(length - 10 + 4, 1)
+
+    # tRNS, if any, sits between IHDR and the first IDAT
+    has_trns = False
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            break
+        length, ctype = struct.unpack('>I4s', header)
+        if ctype in (b'IDAT', b'IEND'):
+            break
+        if ctype == b'tRNS':
+            has_trns = True
+        f.seek(length + 4, 1)
+
+    has_alpha = color_type in PNG_ALPHA_TYPES
+    return {
+        'format': 'PNG',
+        'size': (width, height),
+        'mode': _png_mode(depth, color_type),
+        'color_type': color_type,
+        'alpha': has_alpha,
+        'trns': has_trns,
+        'transparent': has_alpha or has_trns,
+    }
+
+
+def _probe_ico(f):
+    """Probe an ICO stream positioned just after its 4-byte header.
+
+    Reports the largest frame, as Pillow does. PNG frames are probed in
+    place; BMP frames always decode to RGBA (alpha or AND mask).
+    """
+    (count,) = struct.unpack('<H', f.read(2))
+    entries = []
+    for _ in range(count):
+        width, height, _, _, _, bpp, _, offset = struct.unpack('<BBBBHHII', f.read(16))
+        entries.append((width or 256, height or 256, bpp, offset))
+    if not entries:
+        raise ValueError("ICO without frames")
+
+    width, height, bpp, offset = max(entries, key=lambda e: (e[0] * e[1], e[2]))
+    f.seek(offset)
+    if f.read(8) == PNG_SIGNATURE:
+        info = _probe_png(f)
+    else:
+        info = {'size': (width, height), 'mode': 'RGBA', 'color_type': None,
+                'alpha': True, 'trns': False, 'transparent': True}
+    info['format'] = 'ICO'
+    info['sizes'] = sorted({(w, h) for w, h, _, _ in entries})
+    return info
+
+
+def probe(path):
+    """Return size, mode and transparency of a PNG or ICO from its headers.
+
+    The dict has ``format``, ``size`` (width, height), ``mode`` (Pillow
+    mode name), ``alpha`` (alpha channel), ``trns`` (tRNS chunk) and
+    ``transparent`` (either of those); ICOs also list all frame ``sizes``.
+    """
+    with open(path, 'rb') as f:
+        magic = f.read(8)
+        if magic == PNG_SIGNATURE:
+            return _probe_png(f)
+        if magic[:4] == ICO_HEADER:
+            f.seek(4)
+            return _probe_ico(f)
+    raise ValueError("not a PNG or ICO file")
@@ -0,0 +1,67 @@
+"""
+Master-to-variants renderer.
+
+The favicon_*, ios_*, android_* and pwa_* exports are the same artwork at
+different sizes. Instead of opening and background-stripping each one, a
+single high-resolution master is decoded and stripped once, then every
+size is produced through a resampling pyramid: each size is downsampled
+from the nearest larger one rather than from the master.
+"""
+
+import re
+
+from PIL import Image
+
+from .engine import BACKGROUND_COLORS, THRESHOLD, load_image, strip_background
+from .matte import soft_matte
+from .timing import span
+
+# Square icon exports that share the master artwork, e.g. ios_180.png
+SIZED_ICON = re.compile(r'^(favicon|ios|android|pwa)_(\d+)\.png$')
+
+
+def icon_size(filename):
+    """Pixel size encoded in a sized icon filename, or None."""
+    match = SIZED_ICON.match(filename)
+    return int(match.group(2)) if match else None
+
+
+def resample_pyramid(img, sizes, resample=Image.LANCZOS):
+    """Return ``{size: image}`` for square ``sizes``, largest first.
+
+    Each level is resized from the previous (next larger) level. RGBA
+    images are resampled premultiplied by Pillow, so transparent pixels
+    don't bleed their RGB into the edges.
+    """
+    levels = {}
+    current = img
+    for size in sorted(set(sizes), reverse=True):
+        if size > current.width:
+            raise ValueError(f"Master is {img.width}px, smaller than {size}px")
+        if size != current.width:
+            current = current.resize((size, size), resample)
+        levels[size] = current
+    return levels
+
+
+def render_variants(master_path, filenames, colors=BACKGROUND_COLORS, threshold=THRESHOLD,
+                    connected=False, matte=None):
+    """Strip ``master_path`` once and render it at every size in ``filenames``.
+
+    Returns ``(images, removed_count)`` where ``images`` maps each sized
+    icon filename to its rendered RGBA image; other filenames are ignored.
+    With ``matte`` as ``(inner, outer)``, the master is soft-matted (see
+    matte.py) instead of cut.
+    """
+    img = load_image(master_path)
+    if matte:
+        img, removed_count = soft_matte(img, colors, *matte, connected=connected)
+    else:
+        img, removed_count = strip_background(img, colors, threshold, connected=connected)
+    if img.width != img.height:
+        raise ValueError(f"Master must be square, got {img.width}x{img.height}")
+
+    sizes = {name: icon_size(name) for name in filenames if icon_size(name)}
+    with span('resample'):
+        levels = resample_pyramid(img, sizes.values())
+    return {name: levels[size] for name, size in sizes.items()}, removed_count
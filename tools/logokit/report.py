@@ -0,0 +1,198 @@
+"""
+``logo analyze``: report transparency and content stats for every export.
+
+One decode per file; the stats come from Pillow's native channel
+operations (see analyze.alpha_stats). From the same decode, one content
+mask serves the wordmark check (see split.py) for the logo-with-title and
+logo_full exports and the launcher safe-zone check (see safezone.py) for
+masked icons; other files skip both. The files come from one scan of LOGO_DIR,
+classified by index.py.
+"""
+
+import fnmatch
+
+from PIL import Image
+
+from .analyze import alpha_histogram, alpha_stats
+from .index import AssetIndex, classify
+from .paths import LOGO_DIR
+from .safezone import ContentTable, check_safe_zones, content_mask, required_zones
+from .split import find_split
+
+
+def has_transparency(img):
+    """Check if image has transparent background."""
+    if img.mode in ('RGBA', 'LA'):
+        # Any pixel not fully opaque shows up in the alpha channel's minimum
+        return img.getchannel('A').getextrema()[0] < 255
+    return False
+
+
+# Exports that are checked for a wordmark
+WORDMARK_PATTERNS = ("logo-with-title-*.png", "logo_full_*.png")
+
+
+def analyze_file(filepath, histogram=False, category=None):
+    """Analyze a logo file and return its properties.
+
+    With ``histogram``, also bucket its alpha values and count halo pixels
+    (see matte.halo_count). ``category`` is the file's index.CATEGORIES
+    entry, classified from its name if not given. Only files matching
+    WORDMARK_PATTERNS are split into mark and wordmark.
+    """
+    try:
+        file_size = filepath.stat().st_size
+        img = Image.open(filepath)
+        width, height = img.size
+        mode = img.mode
+        stats = alpha_stats(img)
+        # An alpha channel counts, and so does a tRNS entry: optimized
+        # exports are palette or gray PNGs carrying their alpha that way
+        transparent = stats['transparent'] and (mode in ('RGBA', 'LA')
+                                                or 'transparency' in img.info)
+        category = category or classify(filepath.name)
+
+        # A wordmark shows up as a wide band of content past a gap
+        needs_split = any(fnmatch.fnmatch(filepath.name, p) for p in WORDMARK_PATTERNS)
+        zones = required_zones(filepath.name)
+        mask = content_mask(img) if needs_split or zones else None
+        split = find_split(mask) if needs_split else None
+        table = ContentTable(mask) if zones else None
+
+        result = {
+            'path': filepath,
+            'name': filepath.name,
+            'width': width,
+            'height': height,
+            'mode': mode,
+            'transparent': transparent,
+            'transparent_fraction': stats['transparent_fraction'],
+            'bbox': stats['bbox'],
+            'edge_color': stats['edge_color'],
+            'softness': stats['softness'],
+            'size': file_size,
+            'has_title': split is not None,
+            'split': split,
+            'safe_zone': check_safe_zones(img, filepath.name, table),
+            'category': category,
+            'needs_fix': not transparent and ('favicon' in filepath.name.lower() or
+                                               'ios' in filepath.name.lower() or
+                                               'android' in filepath.name.lower() or
+                                               'pwa' in filepath.name.lower() or
+                                               'maskable' in filepath.name.lower())
+        }
+        if histogram:
+            from .matte import halo_count  # numpy; only needed here
+            result['alpha_histogram'] = alpha_histogram(img)
+            result['halo'] = halo_count(img) if transparent else None
+        return result
+    except Exception as e:
+        return {
+            'path': filepath,
+            'name': filepath.name,
+            'error': str(e)
+        }
+
+
+def print_analysis(results):
+    """Print the analysis table and the list of files needing fixes."""
+    # Print analysis
+    print("Logo File Analysis")
+    print("=" * 138)
+    print(f"{'Filename':<40} {'Size':<10} {'Dimensions':<11} {'Transparent':<12} "
+          f"{'Clear %':<8} {'Content Box':<22} {'Edge':<8} {'Soft %':<7} {'Needs Fix':<9} "
+          f"{'Safe Zone':<9}")
+    print("-" * 138)
+
+    needs_fix = []
+    unsafe = []
+    for r in results:
+        if 'error' in r:
+            print(f"{r['name']:<40} ERROR: {r['error']}")
+            continue
+
+        needs_fix_flag = "YES" if r.get('needs_fix', False) else "NO"
+        transparent_flag = "YES" if r['transparent'] else "NO"
+        dims = f"{r['width']}x{r['height']}"
+        clear = f"{r['transparent_fraction'] * 100:.1f}"
+        box = ",".join(str(v) for v in r['bbox']) if r['bbox'] else "empty"
+        soft = f"{r['softness'] * 100:.1f}"
+        if not r['safe_zone']:
+            safe_flag = "-"
+        elif any(r['safe_zone'].values()):
+            safe_flag = "FAIL"
+            unsafe.append(r)
+        else:
+            safe_flag = "PASS"
+
+        print(f"{r['name']:<40} {r['size']:<10} {dims:<11} {transparent_flag:<12} "
+              f"{clear:<8} {box:<22} {r['edge_color']:<8} {soft:<7} {needs_fix_flag:<9} "
+              f"{safe_flag:<9}")
+
+        if r.get('needs_fix'):
+            needs_fix.append(r)
+
+    print("\n" + "=" * 138)
+    print(f"Files needing fixes: {len(needs_fix)}")
+    if needs_fix:
+        print("\nFiles that need transparent backgrounds:")
+        for r in needs_fix:
+            print(f"  - {r['name']} ({r['width']}x{r['height']})")
+
+    print(f"Safe-zone violations: {len(unsafe)}")
+    if unsafe:
+        print("\nFiles with opaque content outside their mask's safe zone:")
+        for r in unsafe:
+            zones = ", ".join(f"{zone} {count} px" for zone, count in r['safe_zone'].items() if count)
+            print(f"  - {r['name']} ({zones})")
+
+    titled = [r for r in results if r.get('has_title')]
+    print(f"Logos with a wordmark: {len(titled)}")
+    for r in titled:
+        mark = ",".join(str(v) for v in r['split']['mark'])
+        wordmark = ",".join(str(v) for v in r['split']['wordmark'])
+        print(f"  - {r['name']} (mark {mark}, wordmark {wordmark})")
+
+
+def print_histograms(results, buckets=8):
+    """Print per-file alpha histograms and halo counts.
+
+    Columns run from fully clear to fully opaque; a binary cut only fills
+    the outer two, a soft matte the ones in between. Halo is the number of
+    visible pixels still close to a background color (a dark fringe).
+    """
+    step = 254 / buckets
+    edges = [f"<{round(step * (i + 1)) + 1}" for i in range(buckets)]
+    labels = ['0', *edges, '255']
+    width = 40 + 9 * len(labels) + 8
+    print("\nAlpha Histograms")
+    print("=" * width)
+    print(f"{'Filename':<40} " + " ".join(f"{label:>8}" for label in labels) + f" {'Halo':>7}")
+    print("-" * width)
+    for r in results:
+        counts = r.get('alpha_histogram')
+        if counts is None:
+            continue
+        halo = '-' if r['halo'] is None else r['halo']
+        print(f"{r['name']:<40} " + " ".join(f"{n:>8}" for n in counts) + f" {halo:>7}")
+
+
+def add_arguments(parser):
+    parser.add_argument(
+        '--histogram', action='store_true',
+        help="also print each file's alpha histogram and halo pixel count",
+    )
+
+
+def run(parser, args):
+    if not LOGO_DIR.exists():
+        print(f"Error: {LOGO_DIR} does not exist")
+        return 1
+
+    index = AssetIndex(LOGO_DIR)
+    assets = index.files("*.png") + index.files("*.ico")
+    results = [analyze_file(asset.path, args.histogram, asset.category) for asset in assets]
+    print_analysis(results)
+    if args.histogram:
+        print_histograms(results)
+    return 0
@@ -0,0 +1,160 @@
+"""
+Safe-zone checks for masked icons.
+
+Launchers crop icons to a mask: a circle, a rounded square, or (for
+maskable and adaptive icons) anything that contains a centred safe-zone
+circle. Content outside the mask is cut off, so all of it must sit inside
+the zone. Content is every opaque pixel, except that an icon with a
+full-bleed fill (an opaque border, like the maskable icon's teal) only
+counts what differs from that fill: the fill is meant to be cropped.
+
+A ContentTable is built once per decoded image: a summed-area table of
+its content pixels plus their sorted distances from the centre. From it,
+the content count of any rectangle is O(1), the count outside a
+centred circle of any radius is one binary search, and a
+rounded rectangle is a rectangle query plus one single-row query per row
+of each corner. So checking every zone shape against an icon costs
+about as much as decoding it.
+"""
+
+import fnmatch
+import math
+
+import numpy as np
+
+from .detect import border_ring
+from .engine import THRESHOLD
+
+# Alpha at or above which a pixel counts as content (ignores faint fringes)
+OPAQUE_ALPHA = 128
+
+# Share of opaque border pixels from which the border color is a fill
+FILL_SHARE = 0.95
+
+# Zone name -> (shape, size) as fractions of the icon width:
+#   ('circle', radius)  or  ('rounded', (inset, corner radius))
+SAFE_ZONES = {
+    # W3C maskable icons: the centred circle of 80% diameter is never cropped
+    'maskable': ('circle', 0.40),
+    # Android adaptive icons: 66dp circle on the 108dp canvas
+    'adaptive': ('circle', 33 / 108),
+    # Round launcher masks
+    'circle': ('circle', 0.50),
+    # iOS / Android rounded-square masks (corner radius ~22.37% of the width)
+    'rounded': ('rounded', (0.0, 0.2237)),
+}
+
+# Export filename pattern -> zones it must fit
+REQUIRED_ZONES = [
+    ('maskable_icon_*.png', ('maskable',)),
+    ('android_adaptive_foreground.png', ('adaptive',)),
+    ('android_[0-9]*.png', ('circle', 'rounded')),
+    ('pwa_*.png', ('circle', 'rounded')),
+    ('ios_*.png', ('rounded',)),
+]
+
+
+def required_zones(filename):
+    """Names of the safe zones ``filename`` must fit, or () if none apply."""
+    for pattern, zones in REQUIRED_ZONES:
+        if fnmatch.fnmatch(filename, pattern):
+            return zones
+    return ()
+
+
+def content_mask(img, cutoff=OPAQUE_ALPHA):
+    """Boolean (H, W) mask of an image's content pixels (see above)."""
+    rgba = np.asarray(img if img.mode == 'RGBA' else img.convert('RGBA'))
+    content = rgba[..., 3] >= cutoff
+
+    ring = border_ring(rgba)
+    samples = ring[ring[:, 3] == 255, :3]
+    if len(samples) >= FILL_SHARE * len(ring):
+        # Most common border color, with each color packed into one integer
+        packed = samples.astype(np.uint32) @ np.array([1 << 16, 1 << 8, 1], dtype=np.uint32)
+        keys, counts = np.unique(packed, return_counts=True)
+        fill = int(keys[counts.argmax()])
+        # Per channel, which of the 256 values lie past THRESHOLD from the
+        # fill; a pixel differs when any channel does
+        levels = np.arange(256)
+        differs = np.zeros(rgba.shape[:2], dtype=bool)
+        for channel in range(3):
+            far = np.abs(levels - ((fill >> (16 - 8 * channel)) & 0xFF)) > THRESHOLD
+            differs |= far[rgba[..., channel]]
+        content &= differs
+    return content
+
+
+class ContentTable:
+    """Summed-area table over the content pixels of one image."""
+
+    def __init__(self, mask):
+        self.height, self.width = mask.shape
+
+        # sat[y, x] = content pixels in rows < y and columns < x
+        self.sat = np.zeros((self.height + 1, self.width + 1), dtype=np.int64)
+        self.sat[1:, 1:] = mask.cumsum(axis=0).cumsum(axis=1)
+        self.total = int(self.sat[-1, -1])
+
+        ys, xs = np.nonzero(mask)
+        self.radii = np.sort(np.hypot(xs + 0.5 - self.width / 2, ys + 0.5 - self.height / 2))
+
+    def count(self, left, top, right, bottom):
+        """Content pixels in columns [left, right) of rows [top, bottom)."""
+        left, right = max(left, 0), min(right, self.width)
+        top, bottom = max(top, 0), min(bottom, self.height)
+        if left >= right or top >= bottom:
+            return 0
+        sat = self.sat
+        return int(sat[bottom, right] - sat[top, right] - sat[bottom, left] + sat[top, left])
+
+    def outside_circle(self, radius):
+        """Content pixels whose centre lies further than ``radius`` from the image centre."""
+        return self.total - int(np.searchsorted(self.radii, radius, side='right'))
+
+    def outside_rounded_rect(self, inset, corner):
+        """Content pixels outside the centred rectangle ``inset`` px in from
+        each edge with corners rounded to radius ``corner`` px.
+        """
+        left, top = inset, inset
+        right, bottom = self.width - inset, self.height - inset
+        corner = min(corner, (right - left) / 2, (bottom - top) / 2)
+        inside = self.count(math.ceil(left), math.ceil(top), math.floor(right), math.floor(bottom))
+
+        # Take back what each corner square has outside its arc, row by row
+        size = math.ceil(corner)
+        for row in range(size):
+            dy = corner - (row + 0.5)
+            if dy <= 0:
+                continue
+            # Pixels whose centre is further than ``corner`` from the arc centre
+            cut = math.ceil(corner - math.sqrt(max(corner * corner - dy * dy, 0.0)) - 0.5)
+            if cut <= 0:
+                continue
+            x0, x1 = math.ceil(left), math.floor(right)
+            for y in (math.ceil(top) + row, math.floor(bottom) - 1 - row):
+                inside -= self.count(x0, y, x0 + cut, y + 1)
+                inside -= self.count(x1 - cut, y, x1, y + 1)
+        return self.total - inside
+
+    def outside(self, zone):
+        """Content pixels outside a SAFE_ZONES entry, scaled to this image."""
+        shape, size = SAFE_ZONES[zone]
+        scale = min(self.width, self.height)
+        if shape == 'circle':
+            return self.outside_circle(size * scale)
+        inset, corner = size
+        return self.outside_rounded_rect(inset * scale, corner * scale)
+
+
+def check_safe_zones(img, filename, table=None):
+    """Check ``img`` against the zones its filename requires.
+
+    Returns ``{zone: content pixels outside}`` (empty if none apply); the
+    icon passes when every count is 0.
+    """
+    zones = required_zones(filename)
+    if not zones:
+        return {}
+    table = table or ContentTable(content_mask(img))
+    return {zone: table.outside(zone) for zone in zones}
@@ -0,0 +1,164 @@
+"""
+Mark / wordmark splitting for the logo-with-title exports.
+
+A logo-with-title image is the mark with the wordmark set beside or below
+it, separated by empty space. That space shows up in the content
+projection profiles (content pixels per row and per column) as a run of
+empty entries, so one pass over the content mask (see
+safezone.content_mask) finds every candidate gap along both axes.
+
+Each gap splits the content in two groups. A group is a wordmark when it
+is wide (at least WORDMARK_ASPECT times as wide as it is tall) and spans
+at least MIN_SPAN of the other group's width; a stray fragment of the mark
+is neither. Of the splits that leave a wordmark on one side, the one whose
+mark is closest to square wins. Group boxes come from per-row and
+per-column content extents computed alongside the profiles, so trying a
+split never goes back to the pixels.
+
+icon_only() then cuts the mark out and centres it on a square transparent
+canvas: an icon-only variant without another design round-trip.
+"""
+
+import math
+
+import numpy as np
+from PIL import Image
+
+from .safezone import content_mask
+from .timing import span
+
+# Bump when splitting or cropping changes, so icon crops are redone
+SPLIT_VERSION = 1
+
+# Smallest width / height ratio of a wordmark
+WORDMARK_ASPECT = 2.0
+
+# Smallest share of the mark's width a wordmark spans
+MIN_SPAN = 0.5
+
+# Transparent margin around the mark on each side of an icon crop, as a
+# share of the icon's side
+MARGIN = 0.05
+
+
+def _bands(profile):
+    """``[(start, end)]`` runs of non-empty entries of a projection profile."""
+    filled = np.concatenate(([False], profile > 0, [False]))
+    edges = np.flatnonzero(filled[1:] != filled[:-1]).tolist()
+    return list(zip(edges[::2], edges[1::2]))
+
+
+class Profiles:
+    """Row and column projection profiles of a content mask, with extents."""
+
+    def __init__(self, mask):
+        self.height, self.width = mask.shape
+        self.rows = np.count_nonzero(mask, axis=1)
+        self.cols = np.count_nonzero(mask, axis=0)
+
+        # First and one-past-last content column of each row, and likewise
+        # row of each column; only meaningful where the profile is non-zero
+        self.row_start = mask.argmax(axis=1)
+        self.row_end = self.width - mask[:, ::-1].argmax(axis=1)
+        self.col_start = mask.argmax(axis=0)
+        self.col_end = self.height - mask[::-1].argmax(axis=0)
+
+    def box(self, axis, start, end):
+        """(left, top, right, bottom) of the content in rows (or columns) [start, end)."""
+        if axis == 'rows':
+            filled = self.rows[start:end] > 0
+            return (int(self.row_start[start:end][filled].min()), start,
+                    int(self.row_end[start:end][filled].max()), end)
+        filled = self.cols[start:end] > 0
+        return (start, int(self.col_start[start:end][filled].min()),
+                end, int(self.col_end[start:end][filled].max()))
+
+
+def _size(box):
+    left, top, right, bottom = box
+    return right - left, bottom - top
+
+
+def _is_wordmark(box, mark):
+    width, height = _size(box)
+    return width >= WORDMARK_ASPECT * height and width >= MIN_SPAN * _size(mark)[0]
+
+
+def find_split(mask):
+    """Split a content mask into mark and wordmark.
+
+    Returns None when no wordmark is found (an icon-only image), else a
+    dict with:
+      axis      'rows' (wordmark above or below the mark) or 'columns'
+      gap       (start, end) of the empty rows or columns between them
+      mark      (left, top, right, bottom) of the mark's content
+      wordmark  (left, top, right, bottom) of the wordmark's content
+    """
+    profiles = Profiles(mask)
+    best = None
+    for axis, profile in (('rows', profiles.rows), ('columns', profiles.cols)):
+        bands = _bands(profile)
+        for i in range(1, len(bands)):
+            first = profiles.box(axis, bands[0][0], bands[i - 1][1])
+            second = profiles.box(axis, bands[i][0], bands[-1][1])
+            for mark, wordmark in ((first, second), (second, first)):
+                if not _is_wordmark(wordmark, mark):
+                    continue
+                width, height = _size(mark)
+                squareness = abs(math.log(width / height))
+                if best is None or squareness < best[0]:
+                    gap = (bands[i - 1][1], bands[i][0])
+                    best = (squareness, {'axis': axis, 'gap': gap, 'mark': mark,
+                                         'wordmark': wordmark})
+    return best[1] if best else None
+
+
+def split_logo(img):
+    """find_split() for a PIL image's content (see safezone.content_mask)."""
+    with span('split'):
+        return find_split(content_mask(img))
+
+
+def mark_region(split, size):
+    """The part of a ``size`` image on the mark's side of the split's gap."""
+    width, height = size
+    if split is None:
+        return 0, 0, width, height
+    middle = sum(split['gap']) // 2
+    mark, wordmark = split['mark'], split['wordmark']
+    if split['axis'] == 'rows':
+        return (0, 0, width, middle) if mark[1] < wordmark[1] else (0, middle, width, height)
+    return (0, 0, middle, height) if mark[0] < wordmark[0] else (middle, 0, width, height)
+
+
+def icon_only(img, split, margin=MARGIN):
+    """Cut the mark out of a transparent ``img`` onto a square canvas.
+
+    The crop keeps the mark's anti-aliased fringe (everything not fully
+    clear on its side of the gap). With no ``split``, the whole content is
+    used: the image already is icon-only.
+    """
+    icon = img.crop(mark_region(split, img.size))
+    box = icon.getchannel('A').getbbox()
+    if box:
+        icon = icon.crop(box)
+    side = math.ceil(max(icon.size) / (1 - 2 * margin))
+    canvas = Image.new('RGBA', (side, side), (0, 0, 0, 0))
+    canvas.paste(icon, ((side - icon.width) // 2, (side - icon.height) // 2))
+    return canvas
+
+
+def split_stage(img, report):
+    """Pipeline stage: the icon-only crop of a stripped logo-with-title image.
+
+    Records the 'mark' and 'wordmark' boxes (None without a wordmark).
+    """
+    split = split_logo(img)
+    report['mark'] = split['mark'] if split else img.getchannel('A').getbbox()
+    report['wordmark'] = split['wordmark'] if split else None
+    return icon_only(img, split)
+
+
+def split_params(params):
+    """Manifest ``params`` for an icon crop of an output stripped with ``params``."""
+    return {**params, 'split': SPLIT_VERSION, 'margin': MARGIN}
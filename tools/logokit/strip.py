@@ -0,0 +1,433 @@
+"""
+``logo strip``: make the icon exports' dark backgrounds transparent.
+
+The default pass removes the brand background colors from the icon-only
+exports in place (optionally rendering the sized icons from one master or
+streaming huge files in strips), rebuilds favicon.ico from the favicon
+frames and refreshes the frontend copies. ``--box`` runs the app-icon fix
+instead: brand colors matched within a small per-channel tolerance.
+"""
+
+import hashlib
+import os
+
+from .atomic import add_fsync_argument, set_fsync_mode, sync_batch, write_atomic
+from .batch import add_workers_argument, run_batch
+from .detect import cached_palette, describe_palette, keep_palette, palette_for
+from .link import add_link_argument, set_link_mode
+from .engine import (
+    BACKGROUND_COLORS, BOX, THRESHOLD, load_image, strip_background, strip_params,
+)
+from .ico import FAVICON_SIZES, build_ico
+from .index import AssetIndex
+from .manifest import Manifest
+from .matte import DEFAULT_INNER, DEFAULT_OUTER, matte_params, soft_matte
+from .optimize import add_optimize_argument, optimize_params, save_png, saving_note
+from .paths import LOGO_DIR
+from .render import icon_size, render_variants
+from .sync import update_frontend
+from .tiled import peak_rss_mib, strip_background_tiled
+from .timing import add_profile_arguments, span
+
+# Icon-only files (should have transparent bg)
+ICON_FILES = [
+    # Favicons
+    'favicon_16.png', 'favicon_32.png', 'favicon_48.png',
+    'favicon_64.png', 'favicon_128.png',
+    # iOS
+    'ios_76.png', 'ios_120.png', 'ios_152.png',
+    'ios_167.png', 'ios_180.png', 'ios_1024.png',
+    # Android
+    'android_48.png', 'android_72.png', 'android_96.png',
+    'android_144.png', 'android_192.png', 'android_512.png',
+    'android_adaptive_foreground.png',
+    # PWA
+    'pwa_192.png', 'pwa_256.png', 'pwa_384.png', 'pwa_512.png',
+    # Others
+    'maskable_icon_1024.png', 'splash_logo_1200.png',
+    'mono_white.png', 'mono_black.png',
+]
+
+# App icons that --box fixes
+APP_ICON_FILES = [
+    'android_144.png', 'android_192.png', 'android_48.png', 'android_512.png',
+    'android_72.png', 'android_96.png', 'android_adaptive_background.png',
+    'favicon_128.png', 'favicon_16.png', 'favicon_32.png', 'favicon_48.png',
+    'favicon_64.png', 'ios_1024.png', 'ios_120.png', 'ios_152.png',
+    'ios_167.png', 'ios_180.png', 'ios_76.png', 'maskable_icon_1024.png',
+    'pwa_192.png', 'pwa_256.png', 'pwa_384.png', 'pwa_512.png'
+]
+
+# --box matches only navy, charcoal and pure black...
+BOX_COLORS = BACKGROUND_COLORS[:3]
+
+# ...within this per-channel tolerance
+TOLERANCE = 5
+
+
+def edge_params(connected=False, matte=None):
+    """Manifest params for the icon strip: binary cut, or soft matte ``(inner, outer)``."""
+    if matte:
+        return matte_params(BACKGROUND_COLORS, *matte, connected=connected)
+    return strip_params(BACKGROUND_COLORS, THRESHOLD, connected=connected)
+
+
+def remove_background(img_path, output_path=None, tile_rows=None, connected=False,
+                      optimize=None, matte=None, auto_palette=False):
+    """Remove background from image, making it transparent.
+
+    With ``tile_rows`` set, the PNG is streamed in strips of that many rows
+    (0 picks a size automatically) instead of being loaded whole. With
+    ``connected``, only background reachable from the border is removed.
+    ``optimize`` is the per-file PNG optimization budget in seconds. With
+    ``matte`` as ``(inner, outer)``, edges are soft-matted (see matte.py)
+    instead of cut. With ``auto_palette``, the background colors are
+    detected from the image border (see detect.py) instead of using
+    BACKGROUND_COLORS.
+
+    Returns (success, removed count or error, bytes saved or None).
+    """
+    if output_path is None:
+        output_path = img_path
+
+    try:
+        with span('file', img_path):
+            if tile_rows is not None:
+                with span('tiled', bytes_read=os.path.getsize(img_path)):
+                    removed_count = strip_background_tiled(
+                        img_path, output_path, BACKGROUND_COLORS, THRESHOLD, rows=tile_rows
+                    )
+                return True, removed_count, None
+
+            img = load_image(img_path)
+            if matte:
+                img, removed_count = soft_matte(img, BACKGROUND_COLORS, *matte, connected=connected)
+            elif auto_palette:
+                with span('detect'):
+                    colors, thresholds = palette_for(img_path, img)
+                img, removed_count = strip_background(img, colors, thresholds, connected=connected)
+            else:
+                img, removed_count = strip_background(
+                    img, BACKGROUND_COLORS, THRESHOLD, connected=connected
+                )
+
+            saved = save_png(img, output_path, optimize)
+            if auto_palette and output_path == img_path:
+                keep_palette(img_path)
+        return True, removed_count, saved
+    except Exception as e:
+        return False, str(e), None
+
+
+def render_from_master(manifest, master, filenames, connected=False, optimize=None,
+                       matte=None):
+    """Render every sized icon in ``filenames`` from one master export.
+
+    Returns the filenames that were rendered or already up to date; none
+    when the master is missing or can't serve every size (not square, or
+    smaller than the largest target), so the files are stripped one by one.
+    """
+    master_path = LOGO_DIR / master
+    if not master_path.exists():
+        print(f"  ✗ {master}: ERROR - master not found, processing files individually")
+        return []
+
+    params = {**edge_params(connected, matte), 'op': 'render'}
+    params = optimize_params(params, optimize)
+    targets = [f for f in filenames if icon_size(f)]
+    stale = [f for f in targets if not manifest.is_fresh(LOGO_DIR / f, master_path, params)]
+
+    if stale:
+        with span('file', master_path):
+            # The pyramid always covers every target so each size is resampled
+            # from the same chain whether or not its neighbours are stale
+            try:
+                images, _ = render_variants(
+                    master_path, targets, BACKGROUND_COLORS, THRESHOLD, connected, matte
+                )
+            except ValueError as e:
+                print(f"  ✗ {master}: ERROR - {e}, processing files individually")
+                return []
+            saved = {}
+            for filename in stale:
+                saved[filename] = save_png(images[filename], LOGO_DIR / filename, optimize)
+        for filename in stale:
+            manifest.record(LOGO_DIR / filename, master_path, params)
+
+    for filename in targets:
+        if filename in stale:
+            status = f"rendered from {master}{saving_note(saved[filename])}"
+        else:
+            status = "unchanged"
+        print(f"  ✓ {filename}: {status}")
+    return targets
+
+
+def detected_params(path, connected=False, optimize=None):
+    """Manifest params for stripping ``path`` with its detected palette.
+
+    None if the palette hasn't been detected for its current contents.
+    """
+    cached = cached_palette(path)
+    if cached is None:
+        return None
+    return optimize_params(strip_params(*cached, connected=connected), optimize)
+
+
+def process_icon_files(manifest, workers=None, master=None, tile_rows=None, connected=False,
+                       optimize=None, matte=None, filenames=ICON_FILES, auto_palette=False,
+                       index=None):
+    """Process all icon-only files that need transparent backgrounds.
+
+    With ``master``, the sized favicon/ios/android/pwa icons are rendered
+    from that one export and only the remaining files are stripped.
+    ``filenames`` narrows the run to some of ICON_FILES (see watch.py).
+    With ``auto_palette``, each file is stripped with the background
+    palette detected from its own border, and its params say so.
+    ``index`` is an AssetIndex of LOGO_DIR (default: a fresh one).
+    """
+    print("Removing backgrounds from logo files...")
+    print("=" * 70)
+
+    rendered = []
+    if master:
+        rendered = render_from_master(manifest, master, filenames, connected, optimize, matte)
+
+    index = index or AssetIndex(LOGO_DIR)
+    found = [f for f in index.existing(filenames) if f not in rendered]
+    if auto_palette:
+        params = {f: detected_params(LOGO_DIR / f, connected, optimize) for f in found}
+    else:
+        params = dict.fromkeys(found, optimize_params(edge_params(connected, matte), optimize))
+    stale = [f for f in found
+             if params[f] is None or not manifest.is_fresh(LOGO_DIR / f, LOGO_DIR / f, params[f])]
+    jobs = [(LOGO_DIR / f, None, tile_rows, connected, optimize, matte, auto_palette)
+            for f in stale]
+    results = run_batch(remove_background, jobs, workers)
+
+    success_count = len(rendered)
+    for filename in filenames:
+        if filename in rendered:
+            continue
+        if filename not in found:
+            print(f"  SKIP: {filename} (not found)")
+            continue
+        if filename not in stale:
+            print(f"  ✓ {filename}: unchanged")
+            success_count += 1
+            continue
+
+        success, result, saved = next(results)
+        if success:
+            note = saving_note(saved)
+            if auto_palette:
+                # Detected (or reused) by the job; the sidecar now covers the output
+                params[filename] = detected_params(LOGO_DIR / filename, connected, optimize)
+                note = f" ({describe_palette(*cached_palette(LOGO_DIR / filename))}){note}"
+            manifest.record(LOGO_DIR / filename, LOGO_DIR / filename, params[filename])
+            print(f"  ✓ {filename}: {result} pixels made transparent{note}")
+            success_count += 1
+        else:
+            print(f"  ✗ {filename}: ERROR - {result}")
+    # Shuts the pool down, so its reaped workers count toward the peak
+    results.close()
+
+    print("=" * 70)
+    print(f"Processed: {success_count} files")
+    if tile_rows is not None and peak_rss_mib() is not None:
+        print(f"Peak RSS (largest process): {peak_rss_mib():.1f} MiB")
+    return success_count
+
+
+def build_favicon(manifest, index=None):
+    """Rebuild favicon.ico from the processed favicon_*.png frames.
+
+    The PNG bytes go into the ICO as-is; the manifest keys the result on the
+    hash of every frame so an unchanged set is skipped. Returns True if the
+    ICO was rewritten, False if it was current or there are no frames.
+    """
+    index = index or AssetIndex(LOGO_DIR)
+    frames = index.existing([f"favicon_{size}.png" for size in FAVICON_SIZES])
+    frame_paths = [LOGO_DIR / name for name in frames]
+    if not frame_paths:
+        return False
+
+    ico_path = LOGO_DIR / "favicon.ico"
+    frames = [path.read_bytes() for path in frame_paths]
+    params = {
+        'op': 'ico',
+        'frames': {
+            path.name: hashlib.sha256(data).hexdigest()
+            for path, data in zip(frame_paths, frames)
+        },
+    }
+    if manifest.is_fresh(ico_path, frame_paths[-1], params):
+        print(f"  ✓ {ico_path.name} unchanged")
+        return False
+
+    with span('file', ico_path), span('encode') as counters:
+        data = build_ico(frames)
+        write_atomic(ico_path, data)
+        counters['bytes_written'] = len(data)
+    manifest.record(ico_path, frame_paths[-1], params)
+    sizes = ', '.join(path.stem.split('_')[1] for path in frame_paths)
+    print(f"  ✓ {ico_path.name}: built from {len(frames)} frames ({sizes})")
+    return True
+
+
+def make_transparent(img_path, output_path=None, optimize=None):
+    """Make background transparent by removing dark blue/black pixels."""
+    if output_path is None:
+        output_path = img_path
+
+    try:
+        with span('file', img_path):
+            img = load_image(img_path)
+
+            # Make background transparent (already-transparent matches count too)
+            img, transparent_count = strip_background(
+                img, BOX_COLORS, TOLERANCE, metric=BOX, skip_transparent=False
+            )
+
+            saved = save_png(img, output_path, optimize)
+        return True, transparent_count, saved
+    except Exception as e:
+        return False, str(e), None
+
+
+def fix_app_icons(manifest, workers=None, optimize=None):
+    """Fix backgrounds for app icon files; returns the number of errors."""
+    print("Fixing logo backgrounds...")
+    print("=" * 80)
+
+    params = optimize_params(
+        strip_params(BOX_COLORS, TOLERANCE, BOX, skip_transparent=False), optimize
+    )
+    found = AssetIndex(LOGO_DIR).existing(APP_ICON_FILES)
+    stale = [f for f in found if not manifest.is_fresh(LOGO_DIR / f, LOGO_DIR / f, params)]
+    jobs = [(LOGO_DIR / f, None, optimize) for f in stale]
+    results = run_batch(make_transparent, jobs, workers)
+
+    fixed = 0
+    unchanged = 0
+    errors = 0
+
+    for filename in APP_ICON_FILES:
+        if filename not in found:
+            print(f"  SKIP: {filename} (not found)")
+            continue
+        if filename not in stale:
+            print(f"  OK: {filename} (unchanged)")
+            unchanged += 1
+            continue
+
+        success, result, saved = next(results)
+        if success:
+            manifest.record(LOGO_DIR / filename, LOGO_DIR / filename, params)
+            print(f"  FIXED: {filename} ({result} pixels made transparent){saving_note(saved)}")
+            fixed += 1
+        else:
+            print(f"  ERROR: {filename} - {result}")
+            errors += 1
+
+    print("=" * 80)
+    print(f"Fixed: {fixed}, Unchanged: {unchanged}, Errors: {errors}")
+    return errors
+
+
+def add_edge_arguments(parser):
+    """Add the options shared by ``logo strip`` and ``logo watch``."""
+    add_workers_argument(parser)
+    add_optimize_argument(parser)
+    add_fsync_argument(parser)
+    add_link_argument(parser)
+    parser.add_argument(
+        '--master', nargs='?', const='ios_1024.png', default=None,
+        help="render all sized icons from one export (default: ios_1024.png)",
+    )
+    parser.add_argument(
+        '--match', choices=['global', 'connected'], default='global',
+        help="remove every background-colored pixel, or only those connected to the border",
+    )
+    parser.add_argument(
+        '--palette', choices=['brand', 'auto'], default='brand',
+        help="strip the brand background colors (default), or detect each "
+             "file's background from its border",
+    )
+    parser.add_argument(
+        '--edges', choices=['cut', 'soft'], default='cut',
+        help="binary cut at the threshold (default), or a soft matte that fades "
+             "and decontaminates anti-aliased edges",
+    )
+    parser.add_argument(
+        '--matte-range', type=float, nargs=2, metavar=('INNER', 'OUTER'),
+        default=(DEFAULT_INNER, DEFAULT_OUTER),
+        help="soft matte: color distances that are fully background / fully kept "
+             f"(default: {DEFAULT_INNER} {DEFAULT_OUTER})",
+    )
+
+
+def edge_options(parser, args):
+    """Validate the add_edge_arguments() options; return the matte range or None."""
+    inner, outer = args.matte_range
+    if not 0 <= inner < outer:
+        parser.error("--matte-range needs 0 <= INNER < OUTER")
+    if args.palette == 'auto' and (args.master or args.edges == 'soft'):
+        parser.error("--palette auto can't be combined with --master or --edges soft")
+    return (inner, outer) if args.edges == 'soft' else None
+
+
+def add_arguments(parser):
+    add_edge_arguments(parser)
+    add_profile_arguments(parser)
+    parser.add_argument(
+        '--tiled', nargs='?', type=int, const=0, default=None, metavar='ROWS',
+        help="stream images in strips of ROWS rows, so memory scales with the strip "
+             "rather than the image (default: auto)",
+    )
+    parser.add_argument(
+        '--box', action='store_true',
+        help="fix the app icons instead: brand colors within a per-channel "
+             f"tolerance of {TOLERANCE}, no frontend update",
+    )
+
+
+def run(parser, args):
+    if args.box and (args.master or args.tiled is not None or args.match != 'global'):
+        parser.error("--box can't be combined with --master, --tiled or --match")
+    if args.tiled is not None and args.match == 'connected':
+        parser.error("--tiled only supports --match global")
+    if args.tiled is not None and args.optimize is not None:
+        parser.error("--tiled can't be combined with --optimize")
+    if args.edges == 'soft' and (args.box or args.tiled is not None):
+        parser.error("--edges soft can't be combined with --box or --tiled")
+    if args.palette == 'auto' and (args.box or args.tiled is not None):
+        parser.error("--palette auto can't be combined with --box or --tiled")
+    matte = edge_options(parser, args)
+
+    if not LOGO_DIR.exists():
+        print(f"Error: {LOGO_DIR} does not exist")
+        return 1
+
+    set_fsync_mode(args.fsync)
+    set_link_mode(args.link)
+    manifest = Manifest.for_logo_dir(LOGO_DIR)
+    if args.box:
+        errors = fix_app_icons(manifest, args.workers, args.optimize)
+        manifest.save()
+        sync_batch()
+        return 0 if errors == 0 else 1
+
+    # Stripping rewrites files in place, so one listing serves both steps
+    index = AssetIndex(LOGO_DIR)
+    process_icon_files(
+        manifest, args.workers, args.master, args.tiled, args.match == 'connected',
+        args.optimize, matte, auto_palette=args.palette == 'auto', index=index,
+    )
+    build_favicon(manifest, index)
+    update_frontend(manifest)
+
+    manifest.save()
+    sync_batch()
+    print("\nDone!")
+    return 0
@@ -0,0 +1,248 @@
+"""
+``logo sync``: copy the processed exports into the frontend.
+
+Copies go through the manifest, so an asset whose export hasn't changed is
+left alone, and the result is checked from its PNG header alone. When an
+asset does change, the pixel diff against the old copy is reported (see
+compare.py); that costs a decode, but only for files that are recopied.
+
+Copies are reflinks of the export where the filesystem allows (see
+link.py), so there sync I/O and disk use follow the number of distinct
+exports, not of destinations. ``--duplicates`` lists exports and
+frontend files that hold the same content under different names.
+``--webmanifest`` also syncs the PWA and favicon icons and regenerates
+manifest.webmanifest and index.html's icon tags (see webmanifest.py).
+
+The exports are listed once per run, into an index.AssetIndex.
+"""
+
+import hashlib
+from pathlib import Path
+
+from .atomic import add_fsync_argument, set_fsync_mode, sync_batch
+from .index import AssetIndex
+from .link import (
+    COPY, HARDLINK, REFLINK, add_link_argument, link_atomic, set_link_mode, stray_hardlink,
+)
+from .manifest import COPY_PARAMS, Manifest
+from .paths import FRONTEND_ASSETS, FRONTEND_PUBLIC, LOGO_DIR
+from .probe import probe
+from .timing import add_profile_arguments, span
+
+# Frontend logo -> the export it is copied from
+APP_LOGOS = {
+    'logo-128.png': 'favicon_128.png',
+    'logo-256.png': 'pwa_256.png',
+}
+
+# How each link method is reported
+MATERIALIZED = {REFLINK: 'Cloned', HARDLINK: 'Linked', COPY: 'Copied'}
+
+
+def export_for(path):
+    """The export a frontend logo file is copied from."""
+    name = Path(path).name
+    return LOGO_DIR / APP_LOGOS.get(name, name)
+
+
+def sync_asset(manifest, source, dest):
+    """Materialize ``source`` at ``dest`` unless the manifest says it's current.
+
+    Like manifest.copy_if_changed(), but an existing ``dest`` is compared
+    with ``source`` first, and ``dest`` is linked rather than copied where
+    possible. Returns ``(method, diff)``: the link_atomic() method, or None
+    if nothing was written, and the compare_files() result, or None when
+    nothing had to be compared (current or missing ``dest``). A ``dest``
+    hardlinked to ``source`` is always replaced unless hardlinks were asked
+    for (see link.stray_hardlink()).
+    """
+    stray = stray_hardlink(source, dest)
+    if not stray and manifest.is_fresh(dest, source, COPY_PARAMS):
+        return None, None
+
+    diff = None
+    if Path(dest).exists() and not stray:
+        from .compare import compare_files  # NumPy and PIL; only needed here
+        with span('diff', dest):
+            diff = compare_files(dest, source)
+    method = None
+    if stray or diff is None or not diff['identical']:
+        with span('copy', dest) as counters:
+            method = link_atomic(source, dest)
+            if method == COPY:
+                counters['bytes_written'] = Path(source).stat().st_size
+    manifest.record(dest, source, COPY_PARAMS)
+    return method, diff
+
+
+def _diff_note(diff):
+    if diff is None:
+        return ""
+    from .compare import describe
+    return f" ({describe(diff)})"
+
+
+def update_frontend(manifest, sources=None):
+    """Refresh the logo and favicon copies in frontend/src/assets and public.
+
+    ``sources`` limits the refresh to copies of those export filenames.
+    """
+    print("\nUpdating frontend assets...")
+
+    # Copy updated files to frontend
+    for asset_name, source_name in APP_LOGOS.items():
+        src_path = LOGO_DIR / source_name
+
+        if src_path.exists() and (sources is None or source_name in sources):
+            for dest_dir in [FRONTEND_ASSETS, FRONTEND_PUBLIC]:
+                dest_path = dest_dir / asset_name
+                if dest_dir.exists():
+                    method, diff = sync_asset(manifest, src_path, dest_path)
+                    if method:
+                        print(f"  ✓ {MATERIALIZED[method]} to {dest_path}{_diff_note(diff)}")
+                    else:
+                        print(f"  ✓ {dest_path} unchanged")
+
+    # Copy favicon.ico to public
+    favicon_src = LOGO_DIR / "favicon.ico"
+    favicon_dest = FRONTEND_PUBLIC / "favicon.ico"
+    if favicon_src.exists() and FRONTEND_PUBLIC.exists() and (
+            sources is None or favicon_src.name in sources):
+        method, diff = sync_asset(manifest, favicon_src, favicon_dest)
+        if method:
+            print(f"  ✓ {MATERIALIZED[method]} favicon.ico to {favicon_dest}{_diff_note(diff)}")
+        else:
+            print(f"  ✓ {favicon_dest} unchanged")
+
+
+def verify_app_assets(manifest, index=None):
+    """Create or update the frontend/src/assets logos and report on them.
+
+    ``index`` is an AssetIndex of LOGO_DIR (default: a fresh one).
+    """
+    index = index or AssetIndex(LOGO_DIR)
+    # Ensure assets directory exists
+    FRONTEND_ASSETS.mkdir(parents=True, exist_ok=True)
+
+    print("Verifying app logo assets...")
+    print("=" * 80)
+
+    for asset_name, source_name in APP_LOGOS.items():
+        asset_path = FRONTEND_ASSETS / asset_name
+        source_path = LOGO_DIR / source_name
+
+        if source_name not in index:
+            print(f"  ERROR: Source {source_name} not found")
+            continue
+
+        # Copy if missing or outdated
+        existed = asset_path.exists()
+        method, diff = sync_asset(manifest, source_path, asset_path)
+        if not existed:
+            print(f"  CREATED: {asset_name} ({MATERIALIZED[method].lower()} from {source_name})")
+        elif method:
+            print(f"  UPDATED: {asset_name}{_diff_note(diff)}")
+        else:
+            print(f"  OK: {asset_name} (already exists and matches)")
+
+        # Verify final asset (headers only)
+        info = probe(asset_path)
+        print(f"    Size: {info['size']}, Mode: {info['mode']}, Transparent: {info['transparent']}")
+
+    print("=" * 80)
+    print("Done!")
+
+
+def duplicate_groups(assets, pixels=False):
+    """Group index.Assets holding the same content.
+
+    Returns ``(same_bytes, same_pixels)``: lists of path groups with equal
+    file hashes, and, with ``pixels``, groups that decode to the same
+    RGBA image although their bytes differ (e.g. re-encoded copies).
+    """
+    by_hash = {}
+    for asset in assets:
+        by_hash.setdefault(asset.hash, []).append(asset.path)
+    same_bytes = [group for group in by_hash.values() if len(group) > 1]
+    if not pixels:
+        return same_bytes, []
+
+    from PIL import Image  # Only needed for the pixel comparison
+
+    by_pixels = {}
+    for group in by_hash.values():
+        img = Image.open(group[0])
+        # An ICO opens as its largest frame; only compare like with like
+        key = (img.format, img.size, hashlib.sha256(img.convert('RGBA').tobytes()).hexdigest())
+        by_pixels.setdefault(key, []).append(group)
+    same_pixels = [[path for group in groups for path in group]
+                   for groups in by_pixels.values() if len(groups) > 1]
+    return same_bytes, same_pixels
+
+
+def report_duplicates(pixels=False, index=None):
+    """Print the duplicate-content groups among the exports and frontend logos."""
+    index = index or AssetIndex(LOGO_DIR)
+    assets = index.files('*.png') + index.files('*.ico')
+    for directory in (FRONTEND_ASSETS, FRONTEND_PUBLIC):
+        frontend = AssetIndex(directory)
+        assets += frontend.files('logo-*.png') + frontend.files('*.ico')
+    same_bytes, same_pixels = duplicate_groups(assets, pixels)
+
+    print("\nDuplicate content:")
+    print("=" * 80)
+    reclaimable = 0
+    for group in same_bytes:
+        size = group[0].stat().st_size
+        inodes = {(path.stat().st_dev, path.stat().st_ino) for path in group}
+        extra = size * (len(inodes) - 1)
+        reclaimable += extra
+        state = "all linked" if len(inodes) == 1 else f"{extra} bytes in extra copies"
+        print(f"  {size} bytes, {state}:")
+        for path in group:
+            print(f"    {path}")
+    for group in same_pixels:
+        print("  same pixels, different bytes:")
+        for path in group:
+            print(f"    {path}")
+    print("=" * 80)
+    print(f"Groups: {len(same_bytes)} byte-identical"
+          + (f", {len(same_pixels)} pixel-identical" if pixels else "")
+          + f"; {reclaimable} bytes held more than once")
+
+
+def add_arguments(parser):
+    add_fsync_argument(parser)
+    add_link_argument(parser)
+    add_profile_arguments(parser)
+    parser.add_argument(
+        '--duplicates', action='store_true',
+        help="also list exports and frontend logos with the same bytes",
+    )
+    parser.add_argument(
+        '--pixels', action='store_true',
+        help="with --duplicates, also group files that decode to the same pixels",
+    )
+    parser.add_argument(
+        '--webmanifest', action='store_true',
+        help="also sync the PWA and favicon icons into frontend/public and "
+             "regenerate manifest.webmanifest and index.html's icon <link> tags",
+    )
+
+
+def run(parser, args):
+    if args.pixels and not args.duplicates:
+        parser.error("--pixels needs --duplicates")
+    set_fsync_mode(args.fsync)
+    set_link_mode(args.link)
+    manifest = Manifest.for_logo_dir(LOGO_DIR)
+    index = AssetIndex(LOGO_DIR)
+    verify_app_assets(manifest, index)
+    if args.webmanifest:
+        from .webmanifest import update_web_metadata
+        update_web_metadata(manifest, index)
+    manifest.save()
+    sync_batch()
+    if args.duplicates:
+        report_duplicates(args.pixels, index)
+    return 0
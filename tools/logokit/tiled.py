@@ -0,0 +1,293 @@
+"""
+Streaming tiled background removal for very large masters.
+
+4096px and 8192px artwork doesn't need to be held in memory as one RGBA
+buffer. The PNG is read a strip of rows at a time: IDAT data is inflated
+incrementally, each strip is decoded by Pillow from a small in-memory PNG
+(seeded with the previous strip's last row so Up/Average/Paeth filters
+still resolve), masked, and re-encoded into a single streaming zlib
+stream with adaptive per-row filtering. Memory grows with the strip
+size rather than the image (a strip is held a few times over: decoded,
+as RGBA, masked and filtered), and the pixels written match whole-image
+processing exactly.
+"""
+
+import io
+import struct
+import sys
+import zlib
+
+import numpy as np
+from PIL import Image
+
+from .atomic import atomic_open
+from .classifier import EUCLIDEAN
+from .engine import BACKGROUND_COLORS, THRESHOLD, background_mask
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Bytes per channel group for the 8-bit color types tiled mode supports
+CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+# Target decoded size of one RGBA strip when the row count isn't given
+STRIP_BYTES = 4 << 20
+
+# Largest block of row bytes filtered at once: _filter_rows keeps about
+# twenty temporaries of the block's size, so a whole strip would cost
+# many times the strip itself
+FILTER_BYTES = 256 << 10
+
+# Largest piece of a chunk read from disk at once
+READ_SIZE = 1 << 20
+
+
+def _chunk(ctype, data):
+    return (struct.pack('>I', len(data)) + ctype + data
+            + struct.pack('>I', zlib.crc32(ctype + data) & 0xFFFFFFFF))
+
+
+def peak_rss_mib():
+    """Peak resident memory of this process and its reaped children, in MiB.
+
+    Returns None where the ``resource`` module is unavailable (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+
+class PngStripReader:
+    """Decode a non-interlaced 8-bit PNG one strip of rows at a time."""
+
+    def __init__(self, path, rows=None):
+        self.file = open(path, 'rb')
+        if self.file.read(8) != PNG_SIGNATURE:
+            self.close()
+            raise ValueError(f"{path} is not a PNG file")
+
+        self.header = None
+        self.extra = []  # PLTE / tRNS, needed to decode each strip
+        self._pending = None
+        for ctype, length in self._chunk_headers():
+            if ctype == b'IDAT':
+                self._pending = length
+                break
+            data = self.file.read(length)
+            self.file.read(4)
+            if ctype == b'IHDR':
+                self.header = data
+            elif ctype in (b'PLTE', b'tRNS'):
+                self.extra.append(_chunk(ctype, data))
+
+        if self.header is None or self._pending is None:
+            self.close()
+            raise ValueError(f"{path} has no image data")
+        self.width, self.height, depth, color_type, _, _, interlace = struct.unpack('>IIBBBBB', self.header)
+        if depth != 8 or color_type not in CHANNELS or interlace:
+            self.close()
+            raise ValueError("tiled mode needs an 8-bit, non-interlaced PNG")
+
+        self.stride = 1 + self.width * CHANNELS[color_type]
+        self.rows = rows or max(1, STRIP_BYTES // (self.width * 4))
+
+    def _chunk_headers(self):
+        while True:
+            header = self.file.read(8)
+            if len(header) < 8:
+                return
+            length, ctype = struct.unpack('>I4s', header)
+            yield ctype, length
+
+    def _read(self, size):
+        data = self.file.read(size)
+        if len(data) < size:
+            raise ValueError("truncated PNG: file ends inside a chunk")
+        return data
+
+    def _idat_data(self):
+        """Yield IDAT payload in pieces of at most READ_SIZE bytes."""
+        length = self._pending
+        while True:
+            while length:
+                data = self._read(min(length, READ_SIZE))
+                length -= len(data)
+                yield data
+            self._read(4)  # CRC
+            ctype, length = next(self._chunk_headers(), (b'IEND', 0))
+            if ctype != b'IDAT':
+                return
+
+    def _scanlines(self):
+        """Yield filtered scanlines (filter byte + row bytes).
+
+        Raises ValueError if the zlib stream doesn't end or leaves a
+        partial scanline behind.
+        """
+        inflater = zlib.decompressobj()
+        pending = bytearray()
+        for data in self._idat_data():
+            while data:
+                pending += inflater.decompress(data, READ_SIZE)
+                data = inflater.unconsumed_tail
+                while len(pending) >= self.stride:
+                    yield bytes(pending[:self.stride])
+                    del pending[:self.stride]
+        pending += inflater.flush()
+        while len(pending) >= self.stride:
+            yield bytes(pending[:self.stride])
+            del pending[:self.stride]
+        if not inflater.eof or pending:
+            raise ValueError("truncated PNG: image data ends early")
+
+    def _decode(self, prior, lines):
+        """Decode filtered ``lines`` through Pillow via a small PNG.
+
+        ``prior`` is the previous reconstructed row, prepended unfiltered
+        so the first line's Up/Average/Paeth filters see the right bytes.
+        """
+        count = len(lines) + (prior is not None)
+        header = struct.pack('>II', self.width, count) + self.header[8:]
+        raw = b''.join(([b'\x00' + prior] if prior is not None else []) + lines)
+        png = (PNG_SIGNATURE + _chunk(b'IHDR', header) + b''.join(self.extra)
+               + _chunk(b'IDAT', zlib.compress(raw, 0)) + _chunk(b'IEND', b''))
+        img = Image.open(io.BytesIO(png))
+        img.load()
+        if prior is not None:
+            img = img.crop((0, 1, self.width, count))
+        return img
+
+    def __iter__(self):
+        """Yield each strip as a Pillow image in the file's own mode.
+
+        Raises ValueError unless the image data holds exactly ``height`` rows.
+        """
+        prior = None
+        lines = []
+        count = 0
+        for line in self._scanlines():
+            count += 1
+            if count > self.height:
+                raise ValueError(f"PNG image data has more than {self.height} rows")
+            lines.append(line)
+            if len(lines) == self.rows:
+                strip = self._decode(prior, lines)
+                prior = np.asarray(strip)[-1].tobytes()
+                lines = []
+                yield strip
+        if count != self.height:
+            raise ValueError(f"truncated PNG: {count} of {self.height} rows")
+        if lines:
+            yield self._decode(prior, lines)
+
+    def close(self):
+        self.file.close()
+
+
+def _filter_rows(rows, prior, bpp, filter_type=None):
+    """Apply adaptive PNG filtering to a strip of rows.
+
+    Every filter only reads original bytes, so all five are computed as
+    uint8 array ops over blocks of at most FILTER_BYTES (wrapping is the
+    mod-256 PNG wants); each row keeps the one with the smallest sum of
+    absolute signed bytes, the usual libpng heuristic. A ``filter_type``
+    (0-4) forces that filter on every row instead.
+    """
+    out = np.empty((rows.shape[0], rows.shape[1] + 1), dtype=np.uint8)
+    block = max(1, FILTER_BYTES // max(1, rows.shape[1]))
+    for top in range(0, rows.shape[0], block):
+        _filter_block(rows[top:top + block], prior, bpp, filter_type, out[top:top + block])
+        prior = rows[min(top + block, rows.shape[0]) - 1]
+    return out
+
+
+def _filter_block(rows, prior, bpp, filter_type, out):
+    """Filter ``rows`` (``prior`` above them) into ``out``, filter byte first."""
+    up = np.vstack([prior[None], rows[:-1]])
+    left = np.zeros_like(rows)
+    left[:, bpp:] = rows[:, :-bpp]
+    upleft = np.zeros_like(rows)
+    upleft[:, bpp:] = up[:, :-bpp]
+
+    # Paeth distances; only |a + b - 2c| needs more than 8 bits
+    pa = np.maximum(up, upleft) - np.minimum(up, upleft)
+    pb = np.maximum(left, upleft) - np.minimum(left, upleft)
+    c = upleft.astype(np.int16)
+    pc = np.abs(left.astype(np.int16) - c + (up.astype(np.int16) - c))
+    paeth = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, upleft))
+
+    candidates = (
+        rows,
+        rows - left,
+        rows - up,
+        rows - ((left >> 1) + (up >> 1) + (left & up & 1)),
+        rows - paeth,
+    )
+    if filter_type is None:
+        # min(v, 256 - v) is |v| with v read as a signed byte
+        scores = np.stack([np.minimum(f, 0 - f).sum(axis=1, dtype=np.uint32) for f in candidates])
+        best = scores.argmin(axis=0)
+    else:
+        best = np.full(rows.shape[0], filter_type)
+
+    out[:, 0] = best
+    for filter_type, filtered in enumerate(candidates):
+        chosen = best == filter_type
+        out[chosen, 1:] = filtered[chosen]
+
+
+class PngStripWriter:
+    """Encode RGBA strips into one 8-bit RGBA PNG with a streaming zlib stream."""
+
+    def __init__(self, file, width, height, level=6):
+        self.file = file
+        self.width = width
+        self.prior = np.zeros(width * 4, dtype=np.uint8)
+        self.deflater = zlib.compressobj(level)
+        file.write(PNG_SIGNATURE)
+        file.write(_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)))
+
+    def write(self, rgba):
+        rows = np.ascontiguousarray(rgba).reshape(rgba.shape[0], self.width * 4)
+        data = self.deflater.compress(_filter_rows(rows, self.prior, 4).tobytes())
+        self.prior = rows[-1].copy()
+        if data:
+            self.file.write(_chunk(b'IDAT', data))
+
+    def close(self):
+        self.file.write(_chunk(b'IDAT', self.deflater.flush()))
+        self.file.write(_chunk(b'IEND', b''))
+
+
+def strip_background_tiled(img_path, output_path, colors=BACKGROUND_COLORS,
+                           threshold=THRESHOLD, rows=None, metric=EUCLIDEAN,
+                           skip_transparent=True):
+    """Stream ``img_path`` to ``output_path`` with the background removed.
+
+    Same result as strip_background() on the whole image, processed
+    ``rows`` rows at a time (default: about STRIP_BYTES of RGBA per strip).
+    The output goes through atomic_open(), so ``output_path`` may be the
+    input. Returns the number of pixels made transparent.
+    """
+    reader = PngStripReader(img_path, rows)
+    count = 0
+    with atomic_open(output_path) as f:
+        try:
+            writer = PngStripWriter(f, reader.width, reader.height)
+            for strip in reader:
+                if strip.mode != 'RGBA':
+                    strip = strip.convert('RGBA')
+                rgba = np.array(strip)
+                mask = background_mask(rgba, colors, threshold, metric, skip_transparent)
+                rgba[..., 3][mask] = 0
+                count += int(np.count_nonzero(mask))
+                writer.write(rgba)
+            writer.close()
+        finally:
+            # Closed before the temp file replaces a possibly in-place output
+            reader.close()
+    return count
@@ -0,0 +1,247 @@
+"""
+Per-file, per-stage timing for ``--profile``.
+
+Code marks its stages with ``span()``: decode, convert, mask, encode, copy
+and so on, each with optional counters (bytes read and written, pixels).
+Spans nest inside a ``file`` span naming the file they work on. Nothing is
+recorded, and a span costs one global lookup, unless a command was run
+with ``--profile`` or ``--cprofile``.
+
+Batch jobs run in worker processes, so run_batch wraps each one in call(),
+which records it in isolation and ships its spans (and, with
+``--cprofile``, its profiler stats) back to the parent with the result.
+Span start times come from time.perf_counter(), a system-wide monotonic
+clock on the platforms we run on, so spans from different workers line
+up on one timeline.
+"""
+
+import cProfile
+import json
+import marshal
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from .atomic import write_atomic
+
+# Recording modes, see mode()
+SPANS = 'spans'
+CPROFILE = 'cprofile'
+
+REPORT_VERSION = 1
+
+# Spans recorded so far, or None while not recording
+_events = None
+_mode = None
+_file = None
+_started = None
+# (seconds, label, cProfile stats) of the slowest batch job
+_slowest = None
+
+
+def start(cprofile=False):
+    """Start recording spans; with ``cprofile``, also profile each batch job."""
+    global _events, _mode, _started, _slowest
+    _events = []
+    _mode = CPROFILE if cprofile else SPANS
+    _started = time.perf_counter()
+    _slowest = None
+
+
+def mode():
+    """None when not recording, else SPANS or CPROFILE."""
+    return _mode
+
+
+@contextmanager
+def span(name, file=None, **counters):
+    """Time the block as stage ``name`` of ``file`` (default: the enclosing file).
+
+    Yields a dict the block can add counters to, such as 'bytes_read',
+    'bytes_written' or 'pixels'.
+    """
+    global _file
+    if _events is None:
+        yield counters
+        return
+
+    outer = _file
+    file = str(file) if file is not None else outer
+    if name == 'file':
+        _file = file
+    start = time.perf_counter()
+    try:
+        yield counters
+    finally:
+        _events.append({
+            'name': name,
+            'file': file,
+            'start': start,
+            'seconds': time.perf_counter() - start,
+            'pid': os.getpid(),
+            'counters': counters,
+        })
+        _file = outer
+
+
+def call(func, args, cprofile=False):
+    """Run ``func(*args)`` recording it on its own.
+
+    Returns ``(result, events, (seconds, label, stats))`` for merge();
+    ``stats`` are the cProfile stats with ``cprofile``, else None.
+    """
+    global _events, _file
+    saved = _events, _file
+    _events, _file = [], None
+    profiler = cProfile.Profile() if cprofile else None
+    start = time.perf_counter()
+    try:
+        result = profiler.runcall(func, *args) if profiler else func(*args)
+    finally:
+        seconds = time.perf_counter() - start
+        events = _events
+        _events, _file = saved
+
+    stats = None
+    if profiler:
+        profiler.create_stats()
+        stats = profiler.stats
+    label = str(getattr(args[0], 'source', args[0])) if args else func.__name__
+    return result, events, (seconds, label, stats)
+
+
+def merge(recorded):
+    """Fold a call() result into this process's recording; returns the result."""
+    global _slowest
+    result, events, slowest = recorded
+    _events.extend(events)
+    if slowest[2] is not None and (_slowest is None or slowest[0] > _slowest[0]):
+        _slowest = slowest
+    return result
+
+
+def _summarize(events):
+    """Group spans into per-stage and per-file totals.
+
+    A file's counters are summed over its stages, except 'pixels': every
+    stage that works on the whole image (decode, mask, ...) reports the
+    same pixels, so a file counts the most any one stage reported.
+    """
+    stages = {}
+    files = {}
+    for event in events:
+        counters = event['counters']
+        if event['name'] != 'file':
+            stage = stages.setdefault(event['name'], {'count': 0, 'seconds': 0.0})
+            stage['count'] += 1
+            stage['seconds'] += event['seconds']
+            for key, value in counters.items():
+                stage[key] = stage.get(key, 0) + value
+        if event['file'] is None:
+            continue
+
+        entry = files.setdefault(event['file'], {'file': event['file'], 'seconds': 0.0,
+                                                 'stage_seconds': 0.0, 'stages': {}})
+        if event['name'] == 'file':
+            entry['seconds'] += event['seconds']
+        else:
+            entry['stages'][event['name']] = entry['stages'].get(event['name'], 0.0) + event['seconds']
+            entry['stage_seconds'] += event['seconds']
+            for key, value in counters.items():
+                if key == 'pixels':
+                    entry[key] = max(entry.get(key, 0), value)
+                else:
+                    entry[key] = entry.get(key, 0) + value
+
+    for entry in files.values():
+        # Files only touched by loose spans (e.g. a copy) have no 'file' span
+        entry['seconds'] = entry['seconds'] or entry['stage_seconds']
+        del entry['stage_seconds']
+        if entry.get('pixels') and entry['seconds']:
+            entry['megapixels_per_second'] = entry['pixels'] / entry['seconds'] / 1e6
+    return stages, sorted(files.values(), key=lambda entry: -entry['seconds'])
+
+
+def _trace(events):
+    """Chrome trace-event JSON (chrome://tracing, Perfetto) for ``events``."""
+    origin = min((event['start'] for event in events), default=0.0)
+    return {
+        'traceEvents': [
+            {
+                'name': event['name'] if event['name'] != 'file' else Path(event['file']).name,
+                'cat': 'file' if event['name'] == 'file' else 'stage',
+                'ph': 'X',
+                'ts': (event['start'] - origin) * 1e6,
+                'dur': event['seconds'] * 1e6,
+                'pid': event['pid'],
+                'tid': event['pid'],
+                'args': {'file': event['file'], **event['counters']},
+            }
+            for event in events
+        ],
+        'displayTimeUnit': 'ms',
+    }
+
+
+def finish(path=None, trace=False, cprofile_path=None):
+    """Stop recording, print a stage summary and write the requested files.
+
+    ``path`` gets the per-file/per-stage JSON report, or a Chrome trace
+    with ``trace``; ``cprofile_path`` gets the slowest batch job's stats
+    in pstats format.
+    """
+    global _events, _mode
+    events, _events, _mode = _events, None, None
+    if events is None:
+        return
+    wall = time.perf_counter() - _started
+    stages, files = _summarize(events)
+
+    print(f"\nProfile: {len(files)} files, {wall:.3f} s wall")
+    busy = sum(stage['seconds'] for stage in stages.values()) or 1.0
+    for name, stage in sorted(stages.items(), key=lambda item: -item[1]['seconds']):
+        print(f"  {name:<10} {stage['seconds']:8.3f} s  {stage['seconds'] / busy * 100:5.1f}%  "
+              f"({stage['count']} calls)")
+    if files:
+        print(f"  Slowest file: {files[0]['file']} ({files[0]['seconds']:.3f} s)")
+
+    if path:
+        if trace:
+            report = _trace(events)
+        else:
+            report = {
+                'version': REPORT_VERSION,
+                'command': sys.argv,
+                'wall_seconds': wall,
+                'stages': stages,
+                'files': files,
+            }
+        write_atomic(path, (json.dumps(report, indent=2) + '\n').encode('utf-8'))
+        print(f"  Wrote {'trace' if trace else 'profile'} to {path}")
+
+    if cprofile_path:
+        if _slowest is None:
+            print("  No batch jobs ran; no cProfile stats written")
+        else:
+            seconds, label, stats = _slowest
+            write_atomic(cprofile_path, marshal.dumps(stats))
+            print(f"  Wrote cProfile stats for {label} ({seconds:.3f} s) to {cprofile_path}")
+
+
+def add_profile_arguments(parser):
+    """Add the shared ``--profile`` options to an argparse parser (see cli.py)."""
+    parser.add_argument(
+        '--profile', metavar='FILE',
+        help="write per-file, per-stage timings, bytes and pixel throughput as JSON",
+    )
+    parser.add_argument(
+        '--trace', action='store_true',
+        help="with --profile, write a Chrome trace-event file instead",
+    )
+    parser.add_argument(
+        '--cprofile', metavar='FILE',
+        help="profile every file with cProfile and keep the slowest's stats "
+             "(read with python -m pstats FILE)",
+    )
@@ -0,0 +1,294 @@
+"""
+``logo variants``: derive mono, tinted and inverted logos from one master.
+
+Every color variant of the mark is the same artwork with its colors
+remapped, so instead of a design export per color, one transparent master
+(default: ios_1024.png, its brand background stripped in memory) is decoded
+once and resampled once per size (see render.resample_pyramid). Each
+variant is then a per-channel lookup table applied with Image.point(), a
+native operation, to a shared per-size buffer:
+
+  mono    every channel maps to the ink color: a flat silhouette;
+  tint    the master's luminance, shaded from black up to the ink color;
+  invert  each channel maps to 255 minus itself.
+
+Alpha is carried over untouched, and a variant with a background is
+alpha-composited onto it. The whole matrix (variants x sizes) runs as one
+batch, one job per size, so each resized buffer serves every color.
+Outputs go to the variants/ folder under LOGO_DIR, as e.g.
+``mono-white_512.png``, and are tracked in the manifest like any export.
+"""
+
+import re
+
+from PIL import Image
+
+from .atomic import add_fsync_argument, set_fsync_mode, sync_batch
+from .batch import add_workers_argument, run_batch
+from .engine import BACKGROUND_COLORS, THRESHOLD, load_image, strip_background, strip_params
+from .manifest import Manifest
+from .optimize import add_optimize_argument, optimize_params, save_png, saving_note
+from .paths import LOGO_DIR
+from .render import resample_pyramid
+from .timing import add_profile_arguments, span
+
+# Bump when the lookup tables or compositing change, so variants are redone
+VARIANT_VERSION = 1
+
+VARIANT_DIR = LOGO_DIR / "variants"
+
+DEFAULT_MASTER = 'ios_1024.png'
+DEFAULT_SIZES = (1024, 512, 256, 128, 64)
+
+# Named colors a variant spec may use besides #RRGGBB
+COLORS = {
+    'black': (0, 0, 0),
+    'white': (255, 255, 255),
+    'teal': (0, 184, 217),   # #00B8D9 - brand teal, the old TEAL_COLOR
+    'navy': (10, 15, 31),    # #0A0F1F - brand navy
+}
+
+# Variant specs (see parse_variant) rendered when none are given
+DEFAULT_VARIANTS = (
+    'mono:black', 'mono:white', 'mono:teal', 'mono:teal:white', 'mono:white:teal',
+)
+
+KINDS = ('mono', 'tint', 'invert')
+
+HEX_COLOR = re.compile(r'^#?([0-9a-fA-F]{6})$')
+
+
+def parse_color(text):
+    """``(name, (r, g, b))`` for a COLORS name or a #RRGGBB color."""
+    if text.lower() in COLORS:
+        return text.lower(), COLORS[text.lower()]
+    match = HEX_COLOR.match(text)
+    if not match:
+        raise ValueError(f"unknown color {text!r}: use #RRGGBB or one of {', '.join(COLORS)}")
+    value = match.group(1).lower()
+    return value, tuple(int(value[i:i + 2], 16) for i in (0, 2, 4))
+
+
+class Variant:
+    """One recoloring: a lookup-table kind, its ink color and an optional background."""
+
+    def __init__(self, kind, ink=None, background=None):
+        self.kind = kind
+        self.ink = ink
+        self.background = background
+
+    @property
+    def name(self):
+        """Filename stem, e.g. ``mono-teal-on-white``."""
+        parts = [self.kind] + ([self.ink[0]] if self.ink else [])
+        if self.background:
+            parts += ['on', self.background[0]]
+        return '-'.join(parts)
+
+    def params(self):
+        """The manifest params identifying this variant's pixels."""
+        return {
+            'op': 'variant',
+            'version': VARIANT_VERSION,
+            'kind': self.kind,
+            'ink': list(self.ink[1]) if self.ink else None,
+            'background': list(self.background[1]) if self.background else None,
+        }
+
+
+def parse_variant(spec):
+    """A Variant from ``KIND[:INK[:BACKGROUND]]``, e.g. ``mono:teal:white``."""
+    kind, *colors = spec.split(':')
+    if kind not in KINDS:
+        raise ValueError(f"unknown variant kind {kind!r}: use one of {', '.join(KINDS)}")
+    if len(colors) > 2:
+        raise ValueError(f"too many colors in {spec!r}")
+    if kind == 'invert':
+        if len(colors) > 1:
+            raise ValueError("invert takes no ink color, only a background")
+        return Variant(kind, background=parse_color(colors[0]) if colors else None)
+    if not colors:
+        raise ValueError(f"{kind} needs an ink color, e.g. {kind}:white")
+    return Variant(kind, parse_color(colors[0]),
+                   parse_color(colors[1]) if len(colors) > 1 else None)
+
+
+def lookup_table(variant, peak=255):
+    """The 768-entry RGB point table for ``variant``.
+
+    Tint tables are applied to the luminance (as RGB) and scaled so the
+    master's brightest visible luminance, ``peak``, maps to the ink color.
+    """
+    if variant.kind == 'invert':
+        return [255 - value for value in range(256)] * 3
+    ink = variant.ink[1]
+    if variant.kind == 'mono':
+        return [channel for channel in ink for _ in range(256)]
+    return [min(255, round(channel * value / max(peak, 1))) for channel in ink
+            for value in range(256)]
+
+
+def visible_peak(img):
+    """Brightest luminance among the visible pixels of an RGBA image."""
+    visible = img.getchannel('A').point([0] + [255] * 255)
+    hist = img.convert('L').histogram(mask=visible)
+    return max((value for value, count in enumerate(hist) if count), default=255)
+
+
+def render_variant(rgb, gray, alpha, variant, peak):
+    """Apply ``variant`` to one size's shared RGB, luminance and alpha buffers."""
+    base = gray if variant.kind == 'tint' else rgb
+    img = base.point(lookup_table(variant, peak))
+    img.putalpha(alpha)
+    if variant.background:
+        canvas = Image.new('RGBA', img.size, variant.background[1] + (255,))
+        canvas.alpha_composite(img)
+        img = canvas
+    return img
+
+
+def render_size(img, variants, paths, peak, optimize=None):
+    """Write every variant of one resampled master; one (success, result) each.
+
+    ``result`` is the bytes saved by optimizing (None without), or the
+    error message.
+    """
+    rgb = img.convert('RGB')
+    gray = img.convert('L').convert('RGB')
+    alpha = img.getchannel('A')
+    results = []
+    for variant, path in zip(variants, paths):
+        try:
+            with span('file', path):
+                with span('lut'):
+                    out = render_variant(rgb, gray, alpha, variant, peak)
+                results.append((True, save_png(out, path, optimize)))
+        except Exception as e:
+            results.append((False, str(e)))
+    return results
+
+
+def load_master(master_path):
+    """Decode the master as RGBA with its brand background stripped.
+
+    A master that is already transparent comes through unchanged.
+    """
+    img, _ = strip_background(load_image(master_path), BACKGROUND_COLORS, THRESHOLD)
+    if img.width != img.height:
+        raise ValueError(f"Master must be square, got {img.width}x{img.height}")
+    return img
+
+
+def variant_path(variant, size):
+    return VARIANT_DIR / f"{variant.name}_{size}.png"
+
+
+def render_matrix(manifest, master_path, variants, sizes, workers=None, optimize=None):
+    """Render every stale variant x size; yields (variant, size, status, result).
+
+    ``status`` is 'unchanged', 'written' or 'error'; ``result`` is as in
+    render_size().
+    """
+    base = optimize_params(strip_params(BACKGROUND_COLORS, THRESHOLD), optimize)
+    params = {(variant.name, size): {**base, **variant.params(), 'size': size}
+              for variant in variants for size in sizes}
+    stale = {size: [variant for variant in variants
+                    if not manifest.is_fresh(variant_path(variant, size), master_path,
+                                             params[variant.name, size])]
+             for size in sizes}
+
+    results = {}
+    todo = [size for size in sizes if stale[size]]
+    if todo:
+        VARIANT_DIR.mkdir(parents=True, exist_ok=True)
+        with span('file', master_path):
+            img = load_master(master_path)
+            peak = visible_peak(img)
+            with span('resample'):
+                # The pyramid covers every size so each is resampled the same way
+                levels = resample_pyramid(img, sizes)
+        jobs = [(levels[size], stale[size], [variant_path(v, size) for v in stale[size]],
+                 peak, optimize) for size in todo]
+        for size, done in zip(todo, run_batch(render_size, jobs, workers)):
+            for variant, result in zip(stale[size], done):
+                results[variant.name, size] = result
+
+    for size in sorted(sizes, reverse=True):
+        for variant in variants:
+            if (variant.name, size) not in results:
+                yield variant, size, 'unchanged', None
+                continue
+            success, result = results[variant.name, size]
+            if not success:
+                yield variant, size, 'error', result
+                continue
+            manifest.record(variant_path(variant, size), master_path, params[variant.name, size])
+            yield variant, size, 'written', result
+
+
+def add_arguments(parser):
+    add_workers_argument(parser)
+    add_optimize_argument(parser)
+    add_fsync_argument(parser)
+    add_profile_arguments(parser)
+    parser.add_argument(
+        '--master', default=DEFAULT_MASTER,
+        help=f"transparent square export to derive the variants from (default: {DEFAULT_MASTER})",
+    )
+    parser.add_argument(
+        '--variant', action='append', dest='variants', metavar='KIND:INK[:BACKGROUND]',
+        help="variant to render, repeatable: mono, tint or invert, a color "
+             f"(#RRGGBB or {', '.join(COLORS)}) and an optional background, e.g. "
+             "mono:teal:white or invert (default: "
+             f"{' '.join(DEFAULT_VARIANTS)})",
+    )
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), metavar='PX',
+        help=f"square sizes to render (default: {' '.join(map(str, DEFAULT_SIZES))})",
+    )
+
+
+def run(parser, args):
+    try:
+        variants = [parse_variant(spec) for spec in args.variants or DEFAULT_VARIANTS]
+    except ValueError as e:
+        parser.error(str(e))
+    if any(size <= 0 for size in args.sizes):
+        parser.error("--sizes must be positive")
+    # Later duplicates of a name would overwrite the same files
+    variants = list({variant.name: variant for variant in variants}.values())
+    sizes = sorted(set(args.sizes), reverse=True)
+
+    master_path = LOGO_DIR / args.master
+    if not master_path.exists():
+        print(f"Error: {master_path} does not exist")
+        return 1
+
+    print("=" * 70)
+    print(f"Rendering {len(variants)} variants x {len(sizes)} sizes from {args.master}")
+    print("=" * 70)
+
+    set_fsync_mode(args.fsync)
+    manifest = Manifest.for_logo_dir(LOGO_DIR)
+    errors = 0
+    try:
+        for variant, size, status, result in render_matrix(
+            manifest, master_path, variants, sizes, args.workers, args.optimize
+        ):
+            name = variant_path(variant, size).name
+            if status == 'unchanged':
+                print(f"  ✓ {name}: unchanged")
+            elif status == 'error':
+                print(f"  ✗ {name}: ERROR - {result}")
+                errors += 1
+            else:
+                print(f"  ✓ {name}: written{saving_note(result)}")
+    except ValueError as e:
+        print(f"  ✗ {args.master}: ERROR - {e}")
+        return 1
+    finally:
+        manifest.save()
+        sync_batch()
+
+    print(f"\nVariants in {VARIANT_DIR}")
+    return 0 if errors == 0 else 1
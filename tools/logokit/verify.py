@@ -0,0 +1,89 @@
+"""
+``logo verify``: check the logo files the app ships.
+
+Reads only file headers (see probe), so it starts and finishes in a few
+milliseconds without importing PIL or NumPy. ``--diff`` also compares each
+file with the export it is synced from: a hash read per file, plus a
+decode only for files that differ.
+"""
+
+import os
+
+from .probe import probe
+
+FILES_TO_CHECK = [
+    'frontend/src/assets/logo-128.png',
+    'frontend/src/assets/logo-256.png',
+    'frontend/public/logo-128.png',
+    'frontend/public/logo-256.png',
+    'frontend/public/favicon.ico'
+]
+
+
+def verify_files(files=FILES_TO_CHECK):
+    """Print size, mode and transparency for each file, or why it failed."""
+    print("Verifying all logo files in app:")
+    print("=" * 80)
+
+    for filepath in files:
+        if os.path.exists(filepath):
+            try:
+                info = probe(filepath)
+                print(f"✓ {filepath}")
+                print(f"    Size: {info['size']}, Mode: {info['mode']}, Transparent: {info['transparent']}")
+            except Exception as e:
+                print(f"✗ {filepath} - ERROR: {e}")
+        else:
+            print(f"✗ {filepath} - NOT FOUND")
+
+    print("=" * 80)
+
+
+def diff_files(files=FILES_TO_CHECK, tolerance=0):
+    """Compare each file with its export; return how many are out of date."""
+    from .compare import compare_files, describe  # NumPy and PIL; only for --diff
+    from .sync import export_for
+
+    print("\nComparing with exports:")
+    print("=" * 80)
+
+    stale = 0
+    for filepath in files:
+        source = export_for(filepath)
+        if not os.path.exists(filepath) or not source.exists():
+            print(f"✗ {filepath} - {'NOT FOUND' if source.exists() else f'no export {source}'}")
+            stale += 1
+            continue
+        try:
+            diff = compare_files(filepath, source, tolerance)
+        except Exception as e:
+            print(f"✗ {filepath} - ERROR: {e}")
+            stale += 1
+            continue
+        if diff['changed']:
+            print(f"✗ {filepath} - OUT OF DATE: {describe(diff)}")
+            stale += 1
+        else:
+            print(f"✓ {filepath} - {describe(diff)}")
+
+    print("=" * 80)
+    return stale
+
+
+def add_arguments(parser):
+    parser.add_argument(
+        '--diff', action='store_true',
+        help="also compare each file with the export it is synced from; "
+             "exits 1 if any differ",
+    )
+    parser.add_argument(
+        '--tolerance', type=int, default=0, metavar='N',
+        help="with --diff, ignore channel differences of up to N (default: 0)",
+    )
+
+
+def run(parser, args):
+    verify_files()
+    if args.diff and diff_files(tolerance=args.tolerance):
+        return 1
+    return 0
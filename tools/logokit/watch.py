@@ -0,0 +1,223 @@
+"""
+``logo watch``: reprocess exports as they are dropped into the logo folder.
+
+After one normal ``logo strip`` pass, the export folder is watched (inotify
+on Linux, polling elsewhere or with ``--poll``). Bursts of writes are
+debounced into one batch, and each batch reprocesses only the files that
+changed plus what depends on them: a new favicon_128.png is stripped,
+favicon.ico is rebuilt from the favicon frames and logo-128.png is
+recopied into the frontend. Our own writes come back as events too; they
+are recognised by hash and ignored.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from datetime import datetime
+
+from .atomic import set_fsync_mode, sync_batch
+from .link import set_link_mode
+from .ico import FAVICON_SIZES
+from .manifest import Manifest, file_hash
+from .paths import LOGO_DIR
+from .strip import ICON_FILES, add_edge_arguments, build_favicon, edge_options, process_icon_files
+from .sync import APP_LOGOS, update_frontend
+
+# inotify(7) flags: a file finished writing, or was renamed into the folder
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+
+# struct inotify_event header: wd, mask, cookie, len (then the name)
+INOTIFY_EVENT = struct.Struct('iIII')
+
+DEFAULT_DEBOUNCE = 0.5
+POLL_INTERVAL = 1.0
+
+FAVICON_FRAMES = {f"favicon_{size}.png" for size in FAVICON_SIZES}
+
+
+class InotifyWatcher:
+    """Changed filenames in one directory, from Linux inotify via libc."""
+
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+        self.fd = fd
+
+    def read(self, timeout=None):
+        """Names written within ``timeout`` seconds (forever if None), or an empty set."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        names = set()
+        offset = 0
+        while offset < len(data):
+            _, _, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            names.add(os.fsdecode(data[offset:offset + length].rstrip(b'\0')))
+            offset += length
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Changed filenames in one directory, from comparing mtimes and sizes."""
+
+    def __init__(self, directory, interval=POLL_INTERVAL):
+        self.directory = directory
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue  # Removed mid-scan, e.g. a temp file being renamed
+                snapshot[entry.name] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def read(self, timeout=None):
+        """Names changed within ``timeout`` seconds (forever if None), or an empty set."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            names = {name for name, stat in snapshot.items() if self.snapshot.get(name) != stat}
+            self.snapshot = snapshot
+            if names:
+                return names
+            wait = self.interval
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    return set()
+            time.sleep(wait)
+
+    def close(self):
+        pass
+
+
+def open_watcher(directory, poll=False):
+    """inotify watcher for ``directory``, or a polling one if that's unavailable."""
+    if not poll:
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError):
+            pass  # Not Linux, or out of inotify watches
+    return PollingWatcher(directory)
+
+
+def debounced(watcher, debounce=DEFAULT_DEBOUNCE):
+    """Yield sets of changed names, each once ``debounce`` seconds pass quietly."""
+    while True:
+        names = watcher.read()
+        while True:
+            more = watcher.read(debounce)
+            if not more:
+                break
+            names |= more
+        # Skip our own temp files and hidden files such as the manifest
+        names = {name for name in names if not name.startswith('.') and not name.endswith('.tmp')}
+        if names:
+            yield names
+
+
+def dependents(names, master=None):
+    """Split changed export names into what to redo.
+
+    Returns ``(icons, favicon, sources)``: the icon files to strip or
+    render, whether favicon.ico needs rebuilding, and the export names
+    whose frontend copies need refreshing.
+    """
+    if master in names:
+        icons = list(ICON_FILES)
+    else:
+        icons = [f for f in ICON_FILES if f in names]
+    touched = set(icons) | names
+    favicon = bool(touched & FAVICON_FRAMES)
+    sources = {name for name in touched if name in APP_LOGOS.values()}
+    if favicon or 'favicon.ico' in names:
+        sources.add('favicon.ico')
+    return icons, favicon, sources
+
+
+def process_changes(manifest, names, args, matte):
+    """Reprocess ``names`` and their dependents, then save the manifest."""
+    icons, favicon, sources = dependents(names, args.master)
+    if icons:
+        process_icon_files(
+            manifest, args.workers, args.master, None, args.match == 'connected',
+            args.optimize, matte, filenames=icons, auto_palette=args.palette == 'auto',
+        )
+    if favicon:
+        build_favicon(manifest)
+    if sources:
+        update_frontend(manifest, sources)
+    manifest.save()
+    sync_batch()
+    return set(icons) | names | ({'favicon.ico'} if favicon else set())
+
+
+def add_arguments(parser):
+    add_edge_arguments(parser)
+    parser.add_argument(
+        '--debounce', type=float, default=DEFAULT_DEBOUNCE, metavar='SECONDS',
+        help=f"wait for this long without writes before processing (default: {DEFAULT_DEBOUNCE})",
+    )
+    parser.add_argument(
+        '--poll', action='store_true',
+        help="poll for changes instead of using inotify",
+    )
+
+
+def run(parser, args):
+    matte = edge_options(parser, args)
+    if not LOGO_DIR.exists():
+        print(f"Error: {LOGO_DIR} does not exist")
+        return 1
+
+    set_fsync_mode(args.fsync)
+    set_link_mode(args.link)
+    manifest = Manifest.for_logo_dir(LOGO_DIR)
+    watcher = open_watcher(LOGO_DIR, args.poll)
+    try:
+        # Bring everything up to date once; from here on only changes count
+        process_changes(manifest, set(ICON_FILES) | {'favicon.ico'}, args, matte)
+        seen = {entry.name: file_hash(entry.path) for entry in os.scandir(LOGO_DIR)}
+
+        backend = 'inotify' if isinstance(watcher, InotifyWatcher) else 'polling'
+        print(f"\nWatching {LOGO_DIR} ({backend}); Ctrl-C to stop")
+        for names in debounced(watcher, args.debounce):
+            # Events for files we wrote ourselves come back with known hashes
+            hashes = {name: file_hash(LOGO_DIR / name) for name in names}
+            changed = {name for name, h in hashes.items() if h is not None and seen.get(name) != h}
+            if not changed:
+                continue
+
+            print(f"\n[{datetime.now():%H:%M:%S}] Changed: {', '.join(sorted(changed))}")
+            for name in process_changes(manifest, changed, args, matte):
+                seen[name] = file_hash(LOGO_DIR / name)
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        watcher.close()
+        manifest.save()
+    return 0
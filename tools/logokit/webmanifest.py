@@ -0,0 +1,186 @@
+"""
+PWA manifest icons and <link> tags, generated from the asset index.
+
+The icons the frontend declares are exports: the PWA and maskable icons
+go in manifest.webmanifest's "icons", the favicons and the iOS touch icon
+in index.html's <head>. Which exports play which role is one compiled
+match per indexed name (WEB_ICONS, see index.category_matcher), and sizes
+and types come from the index's header probes, so generating both costs
+no directory walk beyond the index and no decode.
+
+The icons are synced into frontend/public/ (favicon.ico) and
+frontend/public/icons/ (the PNGs) like every frontend copy (see
+sync.sync_asset). index.html gets its tags between the WEB_ICONS_BEGIN
+and WEB_ICONS_END comments, inserted before </head> the first time; the
+rest of the page, and every manifest field but "icons", is left alone.
+"""
+
+import html
+import json
+import re
+
+from .atomic import write_atomic
+from .index import category_matcher
+from .paths import FRONTEND_INDEX, FRONTEND_PUBLIC
+from .sync import MATERIALIZED, sync_asset
+
+WEB_MANIFEST = FRONTEND_PUBLIC / "manifest.webmanifest"
+WEB_ICON_DIR = FRONTEND_PUBLIC / "icons"
+
+# Roles, in the order they are declared
+ANY = 'any'
+MASKABLE = 'maskable'
+ICON = 'icon'
+APPLE_TOUCH_ICON = 'apple-touch-icon'
+
+# Role -> export patterns that play it
+WEB_ICONS = {
+    ANY: ['pwa_*.png'],
+    MASKABLE: ['maskable_icon_*.png'],
+    ICON: ['favicon.ico', 'favicon_[0-9]*.png'],
+    APPLE_TOUCH_ICON: ['ios_180.png'],
+}
+
+_match_role = category_matcher(WEB_ICONS)
+
+MIME_TYPES = {'PNG': 'image/png', 'ICO': 'image/x-icon'}
+
+# Fields of a new manifest.webmanifest; an existing one keeps its own
+DEFAULT_MANIFEST = {
+    'name': 'IceBreaker',
+    'short_name': 'IceBreaker',
+    'start_url': '/',
+    'display': 'standalone',
+    'background_color': '#0A0F1F',
+    'theme_color': '#0A0F1F',
+}
+
+WEB_ICONS_BEGIN = "<!-- logo:icons (generated by `logo sync --webmanifest`) -->"
+WEB_ICONS_END = "<!-- /logo:icons -->"
+WEB_ICONS_BLOCK = re.compile(r'[ \t]*<!-- logo:icons.*?<!-- /logo:icons -->[ \t]*\r?\n?', re.S)
+
+
+def web_icons(index):
+    """The exports in ``index`` that the frontend declares, as dicts.
+
+    Each has 'asset' (the index.Asset), 'role', 'dest' (its frontend
+    copy), 'href', 'sizes' and 'type', sorted by role and then size, an
+    ICO ahead of the PNGs of its role.
+    Files whose headers can't be read are left out.
+    """
+    roles = list(WEB_ICONS)
+    icons = []
+    for asset in index:
+        role, _ = _match_role(asset.name)
+        if role is None or asset.info is None:
+            continue
+        if asset.info['format'] == 'ICO':
+            dest = FRONTEND_PUBLIC / asset.name
+            sizes = " ".join(f"{w}x{h}" for w, h in asset.info['sizes'])
+        else:
+            dest = WEB_ICON_DIR / asset.name
+            sizes = "{}x{}".format(*asset.dimensions)
+        icons.append({
+            'asset': asset,
+            'role': role,
+            'dest': dest,
+            'href': '/' + dest.relative_to(FRONTEND_PUBLIC).as_posix(),
+            'sizes': sizes,
+            'type': MIME_TYPES[asset.info['format']],
+        })
+    icons.sort(key=lambda icon: (roles.index(icon['role']), icon['type'] != MIME_TYPES['ICO'],
+                                 icon['asset'].dimensions[0]))
+    return icons
+
+
+def manifest_icons(icons):
+    """The web manifest "icons" array for ``icons``."""
+    return [
+        {'src': icon['href'], 'sizes': icon['sizes'], 'type': icon['type'],
+         'purpose': icon['role']}
+        for icon in icons if icon['role'] in (ANY, MASKABLE)
+    ]
+
+
+def link_tags(icons):
+    """The <head> tags for ``icons``, ending with the manifest link."""
+    tags = []
+    for icon in icons:
+        if icon['role'] not in (ICON, APPLE_TOUCH_ICON):
+            continue
+        attrs = {'rel': icon['role'], 'type': icon['type'], 'sizes': icon['sizes'],
+                 'href': icon['href']}
+        if icon['role'] == APPLE_TOUCH_ICON:
+            del attrs['type']
+        tags.append("<link " + " ".join(f'{key}="{html.escape(value)}"'
+                                        for key, value in attrs.items()) + ">")
+    tags.append(f'<link rel="manifest" href="/{WEB_MANIFEST.name}">')
+    return tags
+
+
+def write_webmanifest(icons, path=WEB_MANIFEST):
+    """Set the "icons" of the manifest at ``path``; returns True if it changed."""
+    try:
+        old = path.read_text(encoding='utf-8')
+        data = json.loads(old)
+    except (OSError, ValueError):
+        old, data = None, dict(DEFAULT_MANIFEST)
+    data['icons'] = manifest_icons(icons)
+    new = json.dumps(data, indent=2) + '\n'
+    if new == old:
+        return False
+    write_atomic(path, new.encode('utf-8'))
+    return True
+
+
+def write_link_tags(tags, path=FRONTEND_INDEX):
+    """Put ``tags`` into the generated block of the page at ``path``.
+
+    Returns True if the page changed; a missing page is left missing.
+    """
+    try:
+        old = path.read_bytes().decode('utf-8')
+    except FileNotFoundError:
+        return False
+    newline = '\r\n' if '\r\n' in old else '\n'
+    indent = ' ' * 4
+    block = newline.join(indent + line for line in [WEB_ICONS_BEGIN, *tags, WEB_ICONS_END])
+    block += newline
+
+    if WEB_ICONS_BLOCK.search(old):
+        new = WEB_ICONS_BLOCK.sub(lambda _: block, old, count=1)
+    else:
+        head_end = old.find('</head>')
+        if head_end < 0:
+            raise ValueError(f"{path} has no </head>")
+        line_start = old.rfind('\n', 0, head_end) + 1
+        new = old[:line_start] + block + old[line_start:]
+    if new == old:
+        return False
+    write_atomic(path, new.encode('utf-8'))
+    return True
+
+
+def update_web_metadata(manifest, index):
+    """Sync the declared icons and regenerate the web manifest and <link> tags."""
+    print("\nUpdating web manifest and icon links...")
+    WEB_ICON_DIR.mkdir(parents=True, exist_ok=True)
+
+    icons = web_icons(index)
+    for icon in icons:
+        method, _ = sync_asset(manifest, icon['asset'].path, icon['dest'])
+        if method:
+            print(f"  ✓ {MATERIALIZED[method]} to {icon['dest']}")
+
+    if write_webmanifest(icons):
+        print(f"  ✓ Wrote {WEB_MANIFEST} ({len(manifest_icons(icons))} icons)")
+    else:
+        print(f"  ✓ {WEB_MANIFEST} unchanged")
+
+    tags = link_tags(icons)
+    if not FRONTEND_INDEX.exists():
+        print(f"  SKIP: {FRONTEND_INDEX} (not found)")
+    elif write_link_tags(tags):
+        print(f"  ✓ Updated {len(tags)} <link> tags in {FRONTEND_INDEX}")
+    else:
+        print(f"  ✓ {FRONTEND_INDEX} unchanged")
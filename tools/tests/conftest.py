@@ -0,0 +1,6 @@
+"""Put tools/ on sys.path so the tests import logokit like the scripts do."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
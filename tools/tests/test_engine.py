@@ -0,0 +1,63 @@
+"""Vectorized background removal against the original per-pixel loops."""
+
+import math
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from logokit.classifier import BOX
+from logokit.engine import BACKGROUND_COLORS, THRESHOLD, strip_background
+from logokit.fixtures import render_fixture
+from logokit.strip import BOX_COLORS, TOLERANCE
+
+
+def reference_strip(img, colors, matches, skip_transparent):
+    """The loop the scripts used to run: one PixelAccess read per pixel."""
+    img = img.convert('RGBA')
+    pixels = img.load()
+    count = 0
+    for y in range(img.height):
+        for x in range(img.width):
+            r, g, b, a = pixels[x, y]
+            if skip_transparent and a == 0:
+                continue
+            if any(matches((r, g, b), color) for color in colors):
+                pixels[x, y] = (r, g, b, 0)
+                count += 1
+    return img, count
+
+
+def euclidean(rgb, color):
+    return math.sqrt(sum((a - b) ** 2 for a, b in zip(rgb, color))) <= THRESHOLD
+
+
+def box(rgb, color):
+    return all(abs(a - b) <= TOLERANCE for a, b in zip(rgb, color))
+
+
+def near_background(size, seed=0):
+    """RGBA noise clustered around the background colors, some of it clear."""
+    rng = np.random.default_rng(seed)
+    base = np.array(BACKGROUND_COLORS)[rng.integers(len(BACKGROUND_COLORS), size=(size, size))]
+    rgb = np.clip(base + rng.integers(-40, 41, size=(size, size, 3)), 0, 255)
+    alpha = np.where(rng.random((size, size)) < 0.1, 0, 255)
+    return Image.fromarray(np.dstack([rgb, alpha]).astype(np.uint8), 'RGBA')
+
+
+@pytest.mark.parametrize('img', [near_background(64), render_fixture(64)],
+                         ids=['noise', 'fixture'])
+def test_threshold_matches_per_pixel_loop(img):
+    expected, expected_count = reference_strip(img, BACKGROUND_COLORS, euclidean, True)
+    result, count = strip_background(img.convert('RGBA'))
+    assert count == expected_count
+    assert np.array_equal(np.asarray(result), np.asarray(expected))
+
+
+def test_box_matches_per_pixel_loop():
+    img = near_background(64, seed=1)
+    expected, expected_count = reference_strip(img, BOX_COLORS, box, False)
+    result, count = strip_background(img.copy(), BOX_COLORS, TOLERANCE, metric=BOX,
+                                     skip_transparent=False)
+    assert count == expected_count
+    assert np.array_equal(np.asarray(result), np.asarray(expected))
@@ -0,0 +1,62 @@
+"""Border-connected background removal against a plain flood fill."""
+
+from collections import deque
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from logokit.engine import strip_background
+from logokit.floodfill import border_connected
+
+
+def reference_fill(mask):
+    """Breadth-first 4-connected fill seeded from every border pixel."""
+    h, w = mask.shape
+    seen = np.zeros_like(mask, dtype=bool)
+    queue = deque((y, x) for y in range(h) for x in range(w)
+                  if mask[y, x] and (y in (0, h - 1) or x in (0, w - 1)))
+    for y, x in queue:
+        seen[y, x] = True
+    while queue:
+        y, x = queue.popleft()
+        for ny, nx in ((y - 1, x), (y + 1, x), (y, x - 1), (y, x + 1)):
+            if 0 <= ny < h and 0 <= nx < w and mask[ny, nx] and not seen[ny, nx]:
+                seen[ny, nx] = True
+                queue.append((ny, nx))
+    return seen
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (1, 9), (9, 1), (40, 60), (97, 33)])
+@pytest.mark.parametrize("density", [0.3, 0.55, 0.8])
+def test_matches_flood_fill(shape, density):
+    rng = np.random.default_rng(hash((shape, density)) & 0xFFFF)
+    mask = rng.random(shape) < density
+    assert np.array_equal(border_connected(mask), reference_fill(mask))
+
+
+def test_spiral_and_diagonals():
+    # A long winding corridor and diagonal-only contact, which 4-connectivity
+    # must not cross
+    mask = np.zeros((11, 11), dtype=bool)
+    mask[0, :] = mask[:, 10] = mask[10, 1:] = mask[2:, 1] = True
+    mask[2, 1:9] = mask[2:9, 8] = mask[8, 3:9] = mask[4:9, 3] = True
+    mask[5, 5] = mask[4, 4] = True
+    assert np.array_equal(border_connected(mask), reference_fill(mask))
+    assert border_connected(mask)[8, 3] and not border_connected(mask)[5, 5]
+
+
+def test_connected_keeps_enclosed_navy():
+    rgba = np.zeros((32, 32, 4), dtype=np.uint8)
+    rgba[...] = (10, 15, 31, 255)
+    rgba[8:24, 8:24] = (240, 240, 240, 255)
+    rgba[12:20, 12:20] = (10, 15, 31, 255)  # Navy inside the mark
+
+    img, removed = strip_background(Image.fromarray(rgba, 'RGBA'), connected=True)
+    alpha = np.asarray(img)[..., 3]
+    assert removed == 32 * 32 - 16 * 16
+    assert (alpha[12:20, 12:20] == 255).all()
+    assert (alpha[:8] == 0).all()
+
+    _, removed = strip_background(Image.fromarray(rgba, 'RGBA'))
+    assert removed == 32 * 32 - 16 * 16 + 8 * 8
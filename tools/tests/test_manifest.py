@@ -0,0 +1,75 @@
+"""The content-hash manifest: skip unchanged outputs, re-run on any change."""
+
+from logokit.engine import strip_params
+from logokit.fixtures import render_fixture
+from logokit.manifest import Manifest, copy_if_changed
+
+
+def build(source, output):
+    output.write_bytes(source.read_bytes()[::-1])
+
+
+def test_skips_unchanged_and_reruns_on_change(tmp_path):
+    source = tmp_path / "logo.png"
+    output = tmp_path / "out.png"
+    source.write_bytes(b"source v1")
+    params = strip_params()
+
+    manifest = Manifest(tmp_path / ".logo-cache.json")
+    assert not manifest.is_fresh(output, source, params)
+    build(source, output)
+    manifest.record(output, source, params)
+    manifest.save()
+
+    # A new run reads the saved manifest and skips the output
+    manifest = Manifest(tmp_path / ".logo-cache.json")
+    assert manifest.is_fresh(output, source, params)
+
+    # Different parameters
+    assert not manifest.is_fresh(output, source, strip_params(threshold=30))
+    assert not manifest.is_fresh(output, source, strip_params(connected=True))
+
+    # Different source contents
+    source.write_bytes(b"source v2")
+    assert not manifest.is_fresh(output, source, params)
+    build(source, output)
+    manifest.record(output, source, params)
+    assert manifest.is_fresh(output, source, params)
+
+    # Output edited or deleted behind the manifest's back
+    output.write_bytes(b"hand edit")
+    assert not manifest.is_fresh(output, source, params)
+    output.unlink()
+    assert not manifest.is_fresh(output, source, params)
+
+
+def test_in_place_step(tmp_path):
+    path = tmp_path / "logo.png"
+    path.write_bytes(b"stripped")
+    manifest = Manifest(tmp_path / ".logo-cache.json")
+    manifest.record(path, path, {'op': 'optimize'})
+    assert manifest.is_fresh(path, path, {'op': 'optimize'})
+    path.write_bytes(b"replaced")
+    assert not manifest.is_fresh(path, path, {'op': 'optimize'})
+
+
+def test_copy_if_changed(tmp_path):
+    source = tmp_path / "logo.png"
+    dest = tmp_path / "copy.png"
+    render_fixture(32).save(source)
+    manifest = Manifest(tmp_path / ".logo-cache.json")
+
+    assert copy_if_changed(manifest, source, dest)
+    mtime = dest.stat().st_mtime_ns
+    assert not copy_if_changed(manifest, source, dest)
+    assert dest.stat().st_mtime_ns == mtime
+
+    render_fixture(48).save(source)
+    assert copy_if_changed(manifest, source, dest)
+    assert dest.read_bytes() == source.read_bytes()
+
+
+def test_unreadable_manifest_is_all_stale(tmp_path):
+    path = tmp_path / ".logo-cache.json"
+    path.write_text("{not json", encoding='utf-8')
+    assert Manifest(path).entries == {}
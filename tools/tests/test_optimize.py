@@ -0,0 +1,78 @@
+"""Optimized PNGs decode to exactly the pixels they were made from."""
+
+import io
+import struct
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from logokit.engine import strip_background
+from logokit.fixtures import render_fixture
+from logokit.optimize import FILTERS, _idat, _truecolor, optimize_png, save_png
+from logokit.tiled import PNG_SIGNATURE, _chunk
+
+
+def decoded(data):
+    with Image.open(io.BytesIO(data)) as img:
+        return img.mode, np.asarray(img.convert('RGBA'))
+
+
+def noise(mode, size=(48, 40), seed=0):
+    rng = np.random.default_rng(seed)
+    rgba = rng.integers(0, 256, (size[1], size[0], 4), dtype=np.uint8)
+    if mode in ('L', 'LA'):
+        rgba[..., 1] = rgba[..., 2] = rgba[..., 0]
+    if mode in ('L', 'RGB'):
+        rgba[..., 3] = 255
+    else:
+        # Fully transparent pixels keep their color through the encoder too
+        rgba[::3, ::5, 3] = 0
+    return Image.fromarray(rgba, 'RGBA')
+
+
+def stripped_fixture(size):
+    img, _ = strip_background(render_fixture(size))
+    return img
+
+
+@pytest.mark.parametrize("img, mode", [
+    (stripped_fixture(64), 'P'),       # Few colors with alpha: PLTE + tRNS
+    (noise('RGBA'), 'RGBA'),
+    (noise('RGB'), 'RGB'),
+    (noise('L'), 'L'),
+    (noise('LA'), 'LA'),
+    (render_fixture(96).convert('RGBA'), None),
+], ids=['palette', 'rgba', 'rgb', 'gray', 'gray-alpha', 'opaque-fixture'])
+def test_decodes_to_input(img, mode):
+    data, _ = optimize_png(img, budget=10.0)
+    got_mode, pixels = decoded(data)
+    if mode is not None:
+        assert got_mode == mode
+    assert np.array_equal(pixels, np.asarray(img.convert('RGBA')))
+
+
+@pytest.mark.parametrize("filter_type", FILTERS)
+@pytest.mark.parametrize("mode", ['RGBA', 'RGB', 'L', 'LA'])
+def test_every_filter_round_trips(mode, filter_type):
+    # optimize_png() keeps only the smallest candidate, so check each row
+    # filter on each color type directly
+    img = noise(mode, seed=len(mode))
+    rgba = np.ascontiguousarray(np.asarray(img))
+    pixels, color_type = _truecolor(rgba)
+    ihdr = struct.pack('>IIBBBBB', img.width, img.height, 8, color_type, 0, 0, 0)
+    data = (PNG_SIGNATURE + _chunk(b'IHDR', ihdr)
+            + _chunk(b'IDAT', _idat(np.ascontiguousarray(pixels), filter_type, 6, 0))
+            + _chunk(b'IEND', b''))
+    got_mode, got = decoded(data)
+    assert got_mode == mode
+    assert np.array_equal(got, rgba)
+
+
+def test_save_png(tmp_path):
+    img = stripped_fixture(48)
+    path = tmp_path / "logo.png"
+    saved = save_png(img, path, optimize=1.0)
+    assert saved >= 0
+    _, pixels = decoded(path.read_bytes())
+    assert np.array_equal(pixels, np.asarray(img))
@@ -0,0 +1,22 @@
+"""logo analyze on optimized exports."""
+
+from PIL import Image
+
+from logokit.engine import strip_background
+from logokit.fixtures import render_fixture
+from logokit.optimize import save_png
+from logokit.report import analyze_file
+
+
+def test_optimized_transparent_icon(tmp_path):
+    path = tmp_path / "favicon_64.png"
+    img, removed = strip_background(render_fixture(64))
+    assert removed
+    save_png(img, path, optimize=1.0)
+    # Few enough colors for the optimizer to write a palette PNG with tRNS
+    with Image.open(path) as optimized:
+        assert optimized.mode == 'P'
+
+    info = analyze_file(path)
+    assert info['transparent']
+    assert not info['needs_fix']
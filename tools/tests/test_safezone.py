@@ -0,0 +1,84 @@
+"""Summed-area-table safe-zone queries against brute-force pixel checks."""
+
+import math
+
+import numpy as np
+import pytest
+
+from logokit.safezone import SAFE_ZONES, ContentTable
+
+
+def random_mask(shape, seed):
+    return np.random.default_rng(seed).random(shape) < 0.4
+
+
+def centres(mask):
+    h, w = mask.shape
+    ys, xs = np.mgrid[0:h, 0:w]
+    return xs + 0.5, ys + 0.5
+
+
+def brute_outside_circle(mask, radius):
+    h, w = mask.shape
+    px, py = centres(mask)
+    return int((mask & (np.hypot(px - w / 2, py - h / 2) > radius)).sum())
+
+
+def brute_outside_rounded_rect(mask, inset, corner):
+    h, w = mask.shape
+    px, py = centres(mask)
+    x0, y0 = math.ceil(inset), math.ceil(inset)
+    x1, y1 = math.floor(w - inset), math.floor(h - inset)
+    c = min(corner, (w - 2 * inset) / 2, (h - 2 * inset) / 2)
+    ex = np.maximum.reduce([x0 + c - px, px - (x1 - c), np.zeros_like(px)])
+    ey = np.maximum.reduce([y0 + c - py, py - (y1 - c), np.zeros_like(py)])
+    inside = (px > x0) & (px < x1) & (py > y0) & (py < y1) & (ex * ex + ey * ey <= c * c)
+    return int((mask & ~inside).sum())
+
+
+SHAPES = [(1, 1), (7, 7), (32, 32), (33, 33), (40, 25), (19, 64)]
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_count(shape):
+    mask = random_mask(shape, 1)
+    table = ContentTable(mask)
+    h, w = shape
+    rng = np.random.default_rng(2)
+    for _ in range(200):
+        left, right = sorted(rng.integers(-3, w + 4, 2))
+        top, bottom = sorted(rng.integers(-3, h + 4, 2))
+        expected = int(mask[max(top, 0):max(bottom, 0), max(left, 0):max(right, 0)].sum())
+        assert table.count(left, top, right, bottom) == expected
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_outside_circle(shape):
+    mask = random_mask(shape, 3)
+    table = ContentTable(mask)
+    for radius in np.linspace(0, max(shape), 37):
+        assert table.outside_circle(radius) == brute_outside_circle(mask, radius)
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+@pytest.mark.parametrize("inset", [0, 1, 3])
+def test_outside_rounded_rect(shape, inset):
+    mask = random_mask(shape, 4)
+    table = ContentTable(mask)
+    # Off-grid radii, so no pixel centre sits exactly on an arc
+    for corner in np.linspace(0.013, max(shape) / 2 + 2, 29):
+        assert table.outside_rounded_rect(inset, corner) == \
+            brute_outside_rounded_rect(mask, inset, corner)
+
+
+@pytest.mark.parametrize("zone", sorted(SAFE_ZONES))
+@pytest.mark.parametrize("size", [48, 108, 192])
+def test_outside_zone(zone, size):
+    mask = random_mask((size, size), size)
+    shape, extent = SAFE_ZONES[zone]
+    if shape == 'circle':
+        expected = brute_outside_circle(mask, extent * size)
+    else:
+        inset, corner = extent
+        expected = brute_outside_rounded_rect(mask, inset * size, corner * size)
+    assert ContentTable(mask).outside(zone) == expected
@@ -0,0 +1,50 @@
+"""Tiled mode: whole-image parity and truncated input."""
+
+import struct
+import zlib
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from logokit.engine import BACKGROUND_COLORS, THRESHOLD, strip_background
+from logokit.fixtures import render_fixture
+from logokit.tiled import PNG_SIGNATURE, _chunk, strip_background_tiled
+
+
+@pytest.fixture
+def fixture_png(tmp_path):
+    path = tmp_path / "fixture.png"
+    render_fixture(256).save(path)
+    return path
+
+
+def test_matches_whole_image(fixture_png, tmp_path):
+    output = tmp_path / "tiled.png"
+    strip_background_tiled(fixture_png, output, rows=7)
+    expected, _ = strip_background(Image.open(fixture_png).convert('RGBA'),
+                                   BACKGROUND_COLORS, THRESHOLD)
+    assert np.array_equal(np.asarray(Image.open(output)), np.asarray(expected))
+
+
+@pytest.mark.parametrize('keep', [0.5, 0.9])
+def test_truncated_file_raises(fixture_png, tmp_path, keep):
+    data = fixture_png.read_bytes()
+    truncated = tmp_path / "truncated.png"
+    truncated.write_bytes(data[:int(len(data) * keep)])
+    output = tmp_path / "out.png"
+    with pytest.raises(ValueError, match="truncated"):
+        strip_background_tiled(truncated, output, rows=16)
+    assert not output.exists()
+
+
+def test_missing_rows_raise(tmp_path):
+    # A complete zlib stream that holds fewer rows than IHDR promises
+    width, height = 8, 10
+    raw = b''.join(b'\x00' + bytes(width * 3) for _ in range(height - 2))
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    short = tmp_path / "short.png"
+    short.write_bytes(PNG_SIGNATURE + _chunk(b'IHDR', header)
+                      + _chunk(b'IDAT', zlib.compress(raw)) + _chunk(b'IEND', b''))
+    with pytest.raises(ValueError, match="8 of 10 rows"):
+        strip_background_tiled(short, tmp_path / "out.png")
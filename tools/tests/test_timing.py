@@ -0,0 +1,29 @@
+"""--profile summaries: per-file pixel counts and throughput."""
+
+import pytest
+
+from logokit import timing
+from logokit.engine import load_image, strip_background
+from logokit.fixtures import render_fixture
+
+
+@pytest.fixture
+def recording():
+    timing.start()
+    yield
+    timing.finish()
+
+
+def test_file_pixels_counted_once(tmp_path, recording):
+    path = tmp_path / "icon.png"
+    render_fixture(256).save(path)
+    with timing.span('file', path):
+        strip_background(load_image(path))
+
+    stages, files = timing._summarize(timing._events)
+    # decode and mask both report the image's pixels...
+    assert stages['decode']['pixels'] == stages['mask']['pixels'] == 256 * 256
+    # ...but the file is only 256 x 256
+    (entry,) = files
+    assert entry['pixels'] == 256 * 256
+    assert entry['megapixels_per_second'] == pytest.approx(256 * 256 / entry['seconds'] / 1e6)
@@ -1,31 +1,13 @@
 #!/usr/bin/env python3
-"""Verify all logo files in the app are correct."""
+"""
+Verify all logo files in the app are correct.
 
-from PIL import Image
-import os
+Same as ``python tools/logo.py verify``; kept so existing invocations work.
+"""
 
-files_to_check = [
-    'frontend/src/assets/logo-128.png',
-    'frontend/src/assets/logo-256.png',
-    'frontend/public/logo-128.png',
-    'frontend/public/logo-256.png',
-    'frontend/public/favicon.ico'
-]
+import sys
 
-print("Verifying all logo files in app:")
-print("=" * 80)
-
-for filepath in files_to_check:
-    if os.path.exists(filepath):
-        try:
-            img = Image.open(filepath)
-            transparent = img.mode in ('RGBA', 'LA')
-            print(f"✓ {filepath}")
-            print(f"    Size: {img.size}, Mode: {img.mode}, Transparent: {transparent}")
-        except Exception as e:
-            print(f"✗ {filepath} - ERROR: {e}")
-    else:
-        print(f"✗ {filepath} - NOT FOUND")
-
-print("=" * 80)
+from logokit.cli import main
 
+if __name__ == "__main__":
+    sys.exit(main(['verify', *sys.argv[1:]]))